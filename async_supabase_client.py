@@ -0,0 +1,334 @@
+"""
+Async Supabase client for AI Newsletter Dashboard
+asyncio-native counterpart of SupabaseClient for high-concurrency workloads
+
+Requires aiohttp (pip install aiohttp).
+"""
+
+import asyncio
+import random
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Union
+from datetime import datetime
+
+from supabase_client import (
+    REQUEST_TIMEOUT,
+    RETRYABLE_STATUS,
+    SUPABASE_ANON_KEY,
+    SUPABASE_URL,
+    UPSERT_BACKOFF,
+    UPSERT_BATCH_SIZE,
+    UPSERT_MAX_RETRIES,
+    KeysetPager,
+    article_to_row,
+    summarize_batches,
+)
+
+# Requests in flight at once across the whole client
+MAX_CONCURRENCY = 10
+
+
+class AsyncSupabaseClient:
+    """
+    asyncio client with the same methods as SupabaseClient
+    
+    All calls share one aiohttp connection pool; a semaphore caps how many
+    requests are in flight, so callers can gather() hundreds of calls
+    without opening hundreds of connections.
+    
+    Usage:
+        async with AsyncSupabaseClient() as client:
+            results = await client.save_articles(["id-1", "id-2"])
+    """
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        key: Optional[str] = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+        timeout: float = REQUEST_TIMEOUT
+    ):
+        """
+        Args:
+            url: Supabase (or PostgREST-compatible) base URL
+            key: API key
+            max_concurrency: Maximum requests in flight
+            timeout: Per-request timeout in seconds
+        """
+        self.url = (url or SUPABASE_URL).rstrip("/")
+        self.key = key or SUPABASE_ANON_KEY
+        self.headers = {
+            "apikey": self.key,
+            "Authorization": f"Bearer {self.key}",
+            "Content-Type": "application/json",
+            "Prefer": "return=representation"
+        }
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.close()
+    
+    async def close(self):
+        """Close the connection pool"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _ensure_session(self):
+        # Created lazily so they bind to the running event loop
+        if self._session is None:
+            import aiohttp
+            
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+    
+    async def _request(self, method: str, path: str, params=None, json=None, headers=None):
+        """
+        Send one request under the concurrency limit
+        
+        Returns:
+            tuple: (status code, parsed JSON body or text)
+        """
+        session = self._ensure_session()
+        if params is not None:
+            params = [(k, str(v)) for k, v in (params.items() if isinstance(params, dict) else params)]
+        
+        async with self._semaphore:
+            async with session.request(
+                method,
+                f"{self.url}/rest/v1/{path}",
+                params=params,
+                json=json,
+                headers=headers
+            ) as response:
+                text = await response.text()
+                if response.status in (200, 201) and text:
+                    return response.status, await response.json(content_type=None)
+                return response.status, text
+    
+    async def insert_articles(
+        self,
+        articles: List[Dict],
+        batch_size: int = UPSERT_BATCH_SIZE,
+        max_retries: int = UPSERT_MAX_RETRIES,
+        return_rows: bool = False
+    ) -> Dict:
+        """
+        Upsert articles in concurrent batches (same result shape as
+        SupabaseClient.insert_articles)
+        
+        Args:
+            articles: Articles (or article dictionaries) from the pipeline
+            batch_size: Rows per request
+            max_retries: Retries per batch for transient failures
+            return_rows: Ask Supabase to echo the upserted rows back
+            
+        Returns:
+            Result dictionary with success status, count, failed row count
+            and per-batch stats
+        """
+        db_articles = [article_to_row(article) for article in articles]
+        prefer = "return=representation" if return_rows else "return=minimal"
+        headers = {"Prefer": f"{prefer},resolution=merge-duplicates"}
+        
+        results = await asyncio.gather(*[
+            self._upsert_batch(start, db_articles[start:start + batch_size], headers, max_retries, return_rows)
+            for start in range(0, len(db_articles), max(batch_size, 1))
+        ])
+        
+        return summarize_batches(results, return_rows)
+    
+    async def _upsert_batch(self, start, rows, headers, max_retries, return_rows) -> Dict:
+        """POST one batch, retrying transient failures with exponential backoff"""
+        import aiohttp
+        
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                status, body = await self._request(
+                    "POST", "articles", params={"on_conflict": "url"}, json=rows, headers=headers
+                )
+                if status in (200, 201, 204):
+                    return {
+                        "start": start,
+                        "size": len(rows),
+                        "success": True,
+                        "attempts": attempts,
+                        "rows": body if return_rows and isinstance(body, list) else []
+                    }
+                error = f"HTTP {status}: {body}"
+                retryable = status in RETRYABLE_STATUS
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or e.__class__.__name__
+                retryable = True
+            except Exception as e:
+                # e.g. a malformed JSON body: this batch fails, the others go on
+                error = str(e) or e.__class__.__name__
+                retryable = False
+            
+            if not retryable or attempts > max_retries:
+                return {
+                    "start": start,
+                    "size": len(rows),
+                    "success": False,
+                    "attempts": attempts,
+                    "error": error,
+                    "rows": []
+                }
+            
+            await asyncio.sleep(UPSERT_BACKOFF * (2 ** (attempts - 1)) + random.uniform(0, UPSERT_BACKOFF))
+    
+    async def get_articles(self, source: Optional[str] = None, limit: int = 100) -> Dict:
+        """
+        Fetch articles from Supabase
+        
+        Args:
+            source: Filter by source ('bens_bites' or 'ai_rundown')
+            limit: Maximum number of articles to return
+            
+        Returns:
+            Dictionary with articles list
+        """
+        params = {
+            "select": "*",
+            "order": "scraped_at.desc",
+            "limit": limit
+        }
+        if source:
+            params["source"] = f"eq.{source}"
+        
+        try:
+            status, body = await self._request("GET", "articles", params=params)
+            if status == 200:
+                return {"success": True, "articles": body, "count": len(body)}
+            return {"success": False, "error": f"HTTP {status}: {body}", "articles": [], "count": 0}
+        except Exception as e:
+            return {"success": False, "error": str(e), "articles": [], "count": 0}
+    
+    async def get_articles_by_source(self, sources: Iterable[str], limit: int = 100) -> Dict[str, Dict]:
+        """
+        Fetch several sources concurrently
+        
+        Returns:
+            Dictionary of source -> get_articles() result
+        """
+        sources = list(sources)
+        results = await asyncio.gather(*[self.get_articles(source, limit) for source in sources])
+        return dict(zip(sources, results))
+    
+    async def iter_articles(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        source: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+        until: Optional[Union[str, datetime]] = None,
+        page_size: int = 1000
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream matching articles newest first with (scraped_at, id) keyset
+        paging (see SupabaseClient.iter_articles)
+        
+        Raises:
+            RuntimeError: On a non-200 response
+        """
+        pager = KeysetPager(columns, source, since, until, page_size)
+        
+        while not pager.done:
+            status, rows = await self._request("GET", "articles", params=pager.params())
+            if status != 200:
+                raise RuntimeError(f"HTTP {status}: {rows}")
+            for row in pager.advance(rows):
+                yield row
+    
+    async def save_article(self, article_id: str, user_id: Optional[str] = None, notes: Optional[str] = None) -> Dict:
+        """
+        Save/bookmark an article
+        
+        Args:
+            article_id: UUID of the article
+            user_id: Optional user ID (for future auth)
+            notes: Optional user notes
+            
+        Returns:
+            Result dictionary
+        """
+        data = {
+            "article_id": article_id,
+            "user_id": user_id,
+            "notes": notes
+        }
+        
+        try:
+            status, body = await self._request("POST", "saved_articles", json=data)
+            if status in (200, 201):
+                return {"success": True, "saved": body}
+            return {"success": False, "error": f"HTTP {status}: {body}"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def save_articles(
+        self,
+        article_ids: Iterable[str],
+        user_id: Optional[str] = None,
+        notes: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Save many articles concurrently
+        
+        Returns:
+            List of save_article() results, in input order
+        """
+        return list(await asyncio.gather(*[
+            self.save_article(article_id, user_id, notes) for article_id in article_ids
+        ]))
+    
+    async def get_saved_articles(self, user_id: Optional[str] = None) -> Dict:
+        """
+        Get all saved/bookmarked articles
+        
+        Args:
+            user_id: Optional user ID filter
+            
+        Returns:
+            Dictionary with saved articles
+        """
+        params = {
+            "select": "*, articles(*)",
+            "order": "saved_at.desc"
+        }
+        if user_id:
+            params["user_id"] = f"eq.{user_id}"
+        
+        try:
+            status, body = await self._request("GET", "saved_articles", params=params)
+            if status == 200:
+                return {"success": True, "saved_articles": body, "count": len(body)}
+            return {"success": False, "error": f"HTTP {status}: {body}", "saved_articles": [], "count": 0}
+        except Exception as e:
+            return {"success": False, "error": str(e), "saved_articles": [], "count": 0}
+
+
+# Example usage
+if __name__ == "__main__":
+    async def demo():
+        async with AsyncSupabaseClient() as client:
+            results = await client.get_articles_by_source(["bens_bites", "ai_rundown"], limit=5)
+            for source, result in results.items():
+                if result["success"]:
+                    print(f"✅ {source}: {result['count']} articles")
+                else:
+                    print(f"❌ {source}: {result['error']}")
+    
+    asyncio.run(demo())
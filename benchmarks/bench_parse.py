@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Parse Benchmark
+Compares html_extract backends on saved copies of the source pages
+
+Usage:
+    python3 benchmarks/bench_parse.py --fetch     # save live pages to .tmp/pages/
+    python3 benchmarks/bench_parse.py             # benchmark saved pages (or a synthetic one)
+    python3 benchmarks/bench_parse.py page.html   # benchmark specific files
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Add tools directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools'))
+
+import html_extract
+import scrape_airundown
+import scrape_bensbites
+
+
+PAGES_DIR = os.path.join('.tmp', 'pages')
+
+PAGES = {
+    "bensbites_archive.html": ("https://www.bensbites.com/archive", scrape_bensbites),
+    "therundown_home.html": ("https://www.therundown.ai", scrape_airundown),
+}
+
+CARD = (
+    '<div class="post-card"><article>'
+    '<a href="/p/story-{i}"><img src="https://cdn.example.com/{i}.png" alt=""></a>'
+    '<div class="meta"><h3><a href="/p/story-{i}">Story {i}: a new model ships</a></h3>'
+    '<p>Short summary for story {i}, long enough to be used as a description.</p>'
+    '<time datetime="2026-02-08T{h:02d}:00:00Z">Feb 8</time></div>'
+    '<svg viewBox="0 0 24 24"><path d="M20.84 4.61a5.5 5.5 0 0 0-7.78 0L12 5.67"/></svg>'
+    '</article></div>'
+)
+
+
+def synthetic_page(cards=2000):
+    """Archive-like page with inline CSS/JS and many article cards"""
+    head = '<head><style>' + '.c{color:#242424}' * 2000 + '</style></head>'
+    body = ''.join(CARD.format(i=i, h=i % 24) for i in range(cards))
+    return f'<html>{head}<body><nav><a href="/">Home</a></nav>{body}<script>{"var a=1;" * 20000}</script></body></html>'
+
+
+def fetch_pages():
+    """Save the live source pages for offline benchmarking"""
+    import requests
+    
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    headers = {'User-Agent': 'AI-Newsletter-Dashboard/1.0 (Educational Project)'}
+    for filename, (url, _) in PAGES.items():
+        response = requests.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        path = os.path.join(PAGES_DIR, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"💾 Saved {url} -> {path}")
+
+
+def scraper_for(path):
+    """Pick the scraper whose parse_articles() matches a saved page"""
+    entry = PAGES.get(os.path.basename(path))
+    return entry[1] if entry else scrape_airundown
+
+
+def child(backend_name, path, repeat):
+    """Run in a fresh process so max RSS reflects a single backend"""
+    if path == '-':
+        html = synthetic_page()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+    scraper = scraper_for(path)
+    backend = html_extract.get_backend(backend_name)
+    
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        articles = scraper.parse_articles(html, backend=backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    print(json.dumps({
+        "seconds": best,
+        "peakRssKb": rss_after - rss_before,
+        "articles": len(articles)
+    }))
+
+
+def run(paths, repeat):
+    for path in paths:
+        label = 'synthetic (2000 cards)' if path == '-' else path
+        print(f"\n📄 {label}")
+        results = {}
+        for backend_name in ('soup', 'lxml'):
+            proc = subprocess.run(
+                [sys.executable, __file__, '--child', backend_name, path, '--repeat', str(repeat)],
+                capture_output=True, text=True, check=True
+            )
+            results[backend_name] = json.loads(proc.stdout)
+            r = results[backend_name]
+            print(f"   {backend_name:5s} {r['seconds'] * 1000:8.1f} ms  "
+                  f"+{r['peakRssKb'] / 1024:6.1f} MB RSS  {r['articles']} articles")
+        speedup = results['soup']['seconds'] / max(results['lxml']['seconds'], 1e-9)
+        print(f"   ⚡ lxml speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument('paths', nargs='*', help="Saved HTML pages (default: .tmp/pages/*.html)")
+    parser.add_argument('--fetch', action='store_true', help="Save live pages to .tmp/pages/ first")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        child(args.child, args.paths[0], args.repeat)
+        sys.exit(0)
+    
+    if html_extract.lxml_html is None:
+        print("❌ lxml is not installed (pip install lxml)")
+        sys.exit(1)
+    
+    if args.fetch:
+        fetch_pages()
+    
+    paths = args.paths or sorted(glob.glob(os.path.join(PAGES_DIR, '*.html'))) or ['-']
+    run(paths, args.repeat)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Times and memory-profiles each pipeline stage offline, on the recorded
+pages in benchmarks/fixtures/ and on copies scaled to 10x-1000x the cards
+
+Usage:
+    python3 benchmarks/bench_pipeline.py                 # run and print
+    python3 benchmarks/bench_pipeline.py --save          # also update baselines.json
+    python3 benchmarks/bench_pipeline.py --check         # fail on regressions vs baselines.json
+    python3 benchmarks/bench_pipeline.py --scales 1,10   # smaller run
+
+The committed fixtures are hand-built pages in the sources' markup; replace
+them with live captures with benchmarks/record_fixtures.py (then --save).
+Memory is the tracemalloc peak (Python allocations; lxml's C tree is not counted).
+
+--check compares item counts exactly and memory peaks within a tolerance.
+Timings are compared relative to a fixed calibration loop timed on the
+same machine, so a faster or slower machine (or CI runner) doesn't change
+the verdict.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Add repo root and tools directory to path
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'tools'))
+
+import html_extract
+import scrape_airundown
+import scrape_bensbites
+from combine_sources import combine_sources
+from filter_24h import filter_24h
+from time_index import TimeIndex
+from ndjson import iter_batches, write_json_array
+from supabase_client import UPSERT_BATCH_SIZE, article_to_row
+
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINES_PATH = os.path.join(BENCH_DIR, 'baselines.json')
+
+FIXTURES = {
+    "bens_bites": ("bensbites_archive.html", scrape_bensbites),
+    "ai_rundown": ("therundown_home.html", scrape_airundown),
+}
+
+SCALES = (1, 10, 100, 1000)
+STAGES = ('parse', 'combine', 'index', 'filter', 'serialize', 'insert_payload')
+
+# Fixed clock so filter_24h keeps the same articles on every run
+SCRAPED_AT = "2026-02-08T23:30:00Z"
+NOW = datetime(2026, 2, 9, 0, 0, tzinfo=timezone.utc)
+
+# --check: flag a stage that got this much slower (after calibration)
+# or hungrier...
+TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.25
+# ...ignoring differences too small to be more than noise
+MIN_SECONDS = 0.005
+MIN_PEAK_KB = 256
+
+# Rows in the calibration workload (see calibrate)
+CALIBRATION_ROWS = 20000
+
+POST_LINK_RE = re.compile(r'(/p/[^"?#<>\s]+)')
+# Visible text (titles, summaries); skips inline CSS/JSON, which have braces
+TEXT_RE = re.compile(r'>([A-Za-z][^<>{}]{8,})<')
+WORD_RE = re.compile(r'[A-Za-z]+')
+
+
+def _copy(body, k):
+    """Copy k of a page body: new /p/ URLs, and every word of the text tagged with k"""
+    body = POST_LINK_RE.sub(rf'\1-x{k}', body)
+    return TEXT_RE.sub(lambda m: '>' + WORD_RE.sub(lambda w: f'{w.group(0)}{k}', m.group(1)) + '<', body)
+
+
+def scale_page(html, factor):
+    """
+    Repeat the page body factor times
+    
+    Each copy gets its own URLs and wording, so the extra cards are new
+    stories (not duplicates or near-duplicates of each other), while the
+    cross-source overlap inside each copy is kept.
+    """
+    if factor == 1:
+        return html
+    start = html.index('>', html.index('<body')) + 1
+    end = html.rindex('</body>')
+    body = html[start:end]
+    copies = [body] + [_copy(body, k) for k in range(1, factor)]
+    return html[:start] + ''.join(copies) + html[end:]
+
+
+def calibrate(repeat=5):
+    """
+    Best-of-repeat time of a fixed pure-Python workload (JSON, regex, sort)
+    
+    Stands in for "how fast is this machine" when comparing timings
+    recorded elsewhere.
+    """
+    rows = [
+        {"title": f"Story {i}: a new model ships", "url": f"https://example.com/p/{i}", "rank": i * 7919 % 1000}
+        for i in range(CALIBRATION_ROWS)
+    ]
+    
+    def work():
+        parsed = json.loads(json.dumps(rows))
+        parsed.sort(key=lambda row: (row["rank"], row["title"]))
+        return sum(len(WORD_RE.findall(row["title"])) for row in parsed)
+    
+    _, seconds, _ = measure(work, repeat)
+    return seconds
+
+
+def load_fixtures():
+    pages = {}
+    for source, (filename, _) in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, filename), 'r', encoding='utf-8') as f:
+            pages[source] = f.read()
+    return pages
+
+
+def measure(fn, repeat):
+    """
+    Best-of-repeat wall time, plus tracemalloc peak from one extra run
+    
+    Returns:
+        tuple: (result, seconds, peak KB)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak / 1024
+
+
+def run_scale(pages, factor, repeat, tmp_dir):
+    """Run every stage once on pages scaled by factor; returns {stage: stats}"""
+    scaled = {source: scale_page(html, factor) for source, html in pages.items()}
+    backend = html_extract.get_backend()
+    stats = {}
+    
+    # scrape(): everything after the HTTP response
+    def parse():
+        return [
+            {
+                "source": source,
+                "scrapedAt": SCRAPED_AT,
+                "articles": FIXTURES[source][1].parse_articles(html, backend=backend),
+                "errors": []
+            }
+            for source, html in scaled.items()
+        ]
+    
+    outputs, seconds, peak = measure(parse, repeat)
+    stats['parse'] = (seconds, peak, sum(len(output["articles"]) for output in outputs))
+    
+    combined, seconds, peak = measure(lambda: combine_sources(outputs), repeat)
+    stats['combine'] = (seconds, peak, len(combined))
+    
+    # Built once per article set, then queried
+    time_index, seconds, peak = measure(lambda: TimeIndex(combined), repeat)
+    stats['index'] = (seconds, peak, len(time_index))
+    
+    filtered, seconds, peak = measure(lambda: filter_24h(time_index, now=NOW), repeat)
+    stats['filter'] = (seconds, peak, len(filtered))
+    
+    # scrape_all's .tmp/articles.json
+    path = os.path.join(tmp_dir, 'articles.json')
+    count, seconds, peak = measure(
+        lambda: write_json_array(path, (article.to_dict() for article in combined)), repeat
+    )
+    stats['serialize'] = (seconds, peak, count)
+    
+    # What SupabaseClient.insert_articles builds and sends, minus the HTTP calls
+    def insert_payload():
+        rows = [article_to_row(article) for article in combined]
+        return [json.dumps(batch) for batch in iter_batches(rows, UPSERT_BATCH_SIZE)]
+    
+    payloads, seconds, peak = measure(insert_payload, repeat)
+    stats['insert_payload'] = (seconds, peak, len(combined))
+    
+    return {
+        stage: {"seconds": round(seconds, 6), "peakKb": round(peak, 1), "items": items}
+        for stage, (seconds, peak, items) in stats.items()
+    }
+
+
+def run(scales, repeat):
+    pages = load_fixtures()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for factor in scales:
+            # The 1000x pages are large; once is enough to see the trend
+            reps = repeat if factor < 1000 else 1
+            print(f"\n📄 {factor}x cards")
+            results[f"{factor}x"] = run_scale(pages, factor, reps, tmp_dir)
+            for stage in STAGES:
+                r = results[f"{factor}x"][stage]
+                print(f"   {stage:15s} {r['seconds'] * 1000:10.1f} ms  "
+                      f"{r['peakKb'] / 1024:8.1f} MB peak  {r['items']} items")
+    return results
+
+
+def compare(results, baseline, speed=None):
+    """
+    Differences from a saved baseline that look like regressions
+    
+    Args:
+        results (dict): This run's results
+        baseline (dict): Saved results
+        speed (float): This machine's calibration time over the baseline's
+            (> 1 = slower machine); None skips the timing checks
+    
+    Returns:
+        list: Human-readable problems (empty if none)
+    """
+    problems = []
+    for scale, stages in results.items():
+        for stage, r in stages.items():
+            base = baseline.get(scale, {}).get(stage)
+            if base is None:
+                continue
+            label = f"{scale} {stage}"
+            if r['items'] != base['items']:
+                problems.append(f"{label}: {r['items']} items (baseline {base['items']})")
+            if speed is not None:
+                expected = base['seconds'] * speed
+                if r['seconds'] > expected * TOLERANCE and r['seconds'] - expected > MIN_SECONDS:
+                    problems.append(f"{label}: {r['seconds'] * 1000:.1f} ms "
+                                    f"(baseline {expected * 1000:.1f} ms on this machine)")
+            if r['peakKb'] > base['peakKb'] * MEMORY_TOLERANCE and r['peakKb'] - base['peakKb'] > MIN_PEAK_KB:
+                problems.append(f"{label}: {r['peakKb'] / 1024:.1f} MB peak "
+                                f"(baseline {base['peakKb'] / 1024:.1f} MB)")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraping pipeline offline")
+    parser.add_argument('--scales', default=','.join(str(s) for s in SCALES),
+                        help="Comma-separated card multipliers (default 1,10,100,1000)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', action='store_true', help="Write results to benchmarks/baselines.json")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if slower/larger than the baselines")
+    args = parser.parse_args()
+    
+    scales = [int(s) for s in args.scales.split(',') if s]
+    calibration = calibrate()
+    print(f"⏱️  Calibration loop: {calibration * 1000:.1f} ms")
+    results = run(scales, args.repeat)
+    
+    if args.check:
+        try:
+            with open(BASELINES_PATH, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError):
+            print(f"\n❌ No baselines at {BASELINES_PATH} (run with --save first)")
+            sys.exit(1)
+        speed = None
+        if baseline.get("calibrationSeconds"):
+            speed = calibration / baseline["calibrationSeconds"]
+            print(f"\n⏱️  This machine is {speed:.2f}x the baseline's calibration time")
+        else:
+            print("\n⚠️  Baselines have no calibration; timings are report-only")
+        problems = compare(results, baseline["results"], speed)
+        if problems:
+            print(f"\n❌ {len(problems)} regression(s) vs baselines.json:")
+            for problem in problems:
+                print(f"   {problem}")
+            sys.exit(1)
+        print("\n✅ No regressions vs baselines.json")
+    
+    if args.save:
+        with open(BASELINES_PATH, 'w', encoding='utf-8') as f:
+            json.dump({
+                "recorded": datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "backend": html_extract.get_backend().name,
+                "calibrationSeconds": round(calibration, 6),
+                "results": results
+            }, f, indent=2)
+            f.write('\n')
+        print(f"\n💾 Saved baselines to {BASELINES_PATH}")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Fixture Recorder
+Replaces benchmarks/fixtures/ with fresh captures of the live source pages
+
+Usage:
+    python3 benchmarks/record_fixtures.py
+
+Run bench_pipeline.py --save afterwards: baselines only compare against
+the fixtures they were recorded with.
+"""
+
+import os
+import sys
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_parse import PAGES
+
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+
+
+def record_fixtures():
+    headers = {'User-Agent': 'AI-Newsletter-Dashboard/1.0 (Educational Project)'}
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    for filename, (url, scraper) in PAGES.items():
+        response = requests.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        count = len(scraper.parse_articles(response.text))
+        if count == 0:
+            print(f"⚠️  {url}: no articles parsed, keeping the old fixture")
+            continue
+        path = os.path.join(FIXTURES_DIR, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"💾 Saved {url} -> {path} ({count} articles)")
+
+
+if __name__ == "__main__":
+    record_fixtures()
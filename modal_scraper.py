@@ -2,21 +2,71 @@
 Modal Scheduled Scraper for AI Newsletter Dashboard
 Runs every 24 hours to scrape Ben's Bites and The AI Rundown
 
-All scraping logic is included inline to avoid import issues.
+Each registered source (tools/sources.py) is scraped in its own container
+via .map(), so a run takes as long as the slowest source rather than the
+sum of all of them. The outputs are combined, filtered and written to the
+volume once. The scrapers and pipeline steps are the same tools/ modules
+scrape_all.py uses, shipped into the image with add_local_dir.
 """
 
 import modal
+import gzip
+import hashlib
 import json
-from datetime import datetime, timedelta
-import uuid
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+try:
+    from fastapi import Request, Response
+except ImportError:  # only needed inside the web endpoint container
+    Request = Response = None
+
+# tools/ sits next to this file locally and in the container (see image)
+TOOLS_DIR = Path(__file__).parent / "tools"
+sys.path.insert(0, str(TOOLS_DIR))
+
+from sources import SOURCES
+from combine_sources import combine_sources
+from near_dup import SimHashStore
+from filter_24h import filter_24h
+from time_index import TimeIndex
+from archive import ArticleArchive
+from ndjson import write_json_array
+from article_index import DEFAULT_LIMIT, MAX_LIMIT, ArticleIndex
+from negotiation import accepted_encodings, etag_matches
+from ttl_cache import TTLCache
 
 # Create Modal app
-app = modal.App("ai-newsletter-scraper")
+APP_NAME = "ai-newsletter-scraper"
+app = modal.App(APP_NAME)
 
 # Define the image with required dependencies
-image = modal.Image.debian_slim().pip_install(
-    "requests==2.31.0",
-    "beautifulsoup4==4.12.2",
+image = (
+    modal.Image.debian_slim()
+    .pip_install(
+        "requests==2.31.0",
+        "beautifulsoup4==4.12.2",
+        "lxml",
+    )
+    .add_local_dir(TOOLS_DIR, remote_path="/root/tools")
+)
+
+# The web endpoint also needs FastAPI
+web_image = (
+    modal.Image.debian_slim()
+    .pip_install(
+        "requests==2.31.0",
+        "beautifulsoup4==4.12.2",
+        "lxml",
+        "fastapi[standard]",
+    )
+    .add_local_dir(TOOLS_DIR, remote_path="/root/tools")
 )
 
 # Create Modal volume for persistent storage
@@ -25,209 +75,106 @@ volume = modal.Volume.from_name("ai-newsletter-data", create_if_missing=True)
 # Mount path for the volume
 VOLUME_PATH = "/data"
 
+# Per-source container timeout (one slow site can't hold up the rest for long)
+SOURCE_TIMEOUT = 180
 
-def scrape_bensbites():
-    """Scrape Ben's Bites for latest articles"""
-    import requests
-    from bs4 import BeautifulSoup
-    import time
-    
-    output = {
-        "source": "bens_bites",
-        "scrapedAt": datetime.utcnow().isoformat() + "Z",
-        "articlesFound": 0,
-        "articles": [],
-        "errors": []
-    }
-    
-    try:
-        headers = {'User-Agent': 'AI-Newsletter-Dashboard/1.0 (Educational Project)'}
-        url = "https://www.bensbites.com/archive"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        article_links = soup.find_all('a', href=lambda x: x and '/p/' in x)
-        
-        seen_urls = set()
-        
-        for link in article_links:
-            article_url = link.get('href', '')
-            if not article_url or article_url in seen_urls:
-                continue
-                
-            if article_url.startswith('/'):
-                article_url = 'https://www.bensbites.com' + article_url
-            if not article_url.startswith('https://'):
-                continue
-            
-            seen_urls.add(article_url)
-            title = link.get_text(strip=True)
-            
-            if not title or len(title) < 3:
-                continue
-            
-            description = None
-            next_elem = link.find_next_sibling()
-            if next_elem and next_elem.name in ['p', 'div']:
-                desc_text = next_elem.get_text(strip=True)
-                if desc_text and desc_text != title:
-                    description = desc_text
-            
-            imageUrl = None
-            parent = link.find_parent(['div', 'article'])
-            if parent:
-                img = parent.find('img')
-                if img and img.get('src'):
-                    imageUrl = img['src']
-            
-            article = {
-                "title": title,
-                "description": description,
-                "url": article_url,
-                "publishedAt": None,
-                "imageUrl": imageUrl,
-                "category": None
-            }
-            
-            output["articles"].append(article)
-        
-        output["articlesFound"] = len(output["articles"])
-        time.sleep(2)  # Rate limiting
-        
-    except Exception as e:
-        output["errors"].append(f"Error: {str(e)}")
-    
-    return output
+SOURCE_KEYS = [source["key"] for source in SOURCES]
 
+ARTICLES_FILE = f"{VOLUME_PATH}/articles.json"
 
-def scrape_airundown():
-    """Scrape The AI Rundown for latest articles"""
-    import requests
-    from bs4 import BeautifulSoup
-    import time
-    
-    output = {
-        "source": "ai_rundown",
+# ArticleService: how often a warm container checks the volume for a new
+# scrape, and how many rendered responses it keeps per data version
+RELOAD_INTERVAL = 30
+RESPONSE_CACHE_SIZE = 256
+
+
+def scrape_one(key):
+    """Run one registered scraper by key"""
+    source = next(source for source in SOURCES if source["key"] == key)
+    return source["scrape"]()
+
+
+def failed_output(key, error):
+    """Scraper-shaped output for a source whose container failed"""
+    return {
+        "source": key,
         "scrapedAt": datetime.utcnow().isoformat() + "Z",
         "articlesFound": 0,
         "articles": [],
-        "errors": []
+        "errors": [f"Error: {error}"]
     }
-    
-    try:
-        headers = {'User-Agent': 'AI-Newsletter-Dashboard/1.0 (Educational Project)'}
-        url = "https://www.therundown.ai"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find "Latest Articles" section
-        latest_section = None
-        for heading in soup.find_all(['h2', 'h3', 'h4']):
-            if 'latest' in heading.get_text().lower():
-                latest_section = heading.find_parent()
-                break
-        
-        if not latest_section:
-            latest_section = soup
-        
-        article_links = latest_section.find_all('a', href=lambda x: x and '/p/' in x)
-        seen_urls = set()
-        
-        for link in article_links:
-            article_url = link.get('href', '')
-            if not article_url or article_url in seen_urls:
-                continue
-                
-            if article_url.startswith('/'):
-                article_url = 'https://www.therundown.ai' + article_url
-            if not article_url.startswith('https://'):
-                continue
-            
-            seen_urls.add(article_url)
-            title = link.get_text(strip=True)
-            
-            if not title or len(title) < 3:
-                continue
-            
-            description = None
-            next_elem = link.find_next_sibling()
-            if next_elem and next_elem.name in ['p', 'div']:
-                desc_text = next_elem.get_text(strip=True)
-                if desc_text and desc_text != title:
-                    description = desc_text
-            
-            imageUrl = None
-            parent = link.find_parent(['div', 'article'])
-            if parent:
-                img = parent.find('img')
-                if img and img.get('src'):
-                    imageUrl = img['src']
-            
-            article = {
-                "title": title,
-                "description": description,
-                "url": article_url,
-                "publishedAt": None,
-                "imageUrl": imageUrl,
-                "category": None
-            }
-            
-            output["articles"].append(article)
-        
-        output["articlesFound"] = len(output["articles"])
-        time.sleep(2)
-        
-    except Exception as e:
-        output["errors"].append(f"Error: {str(e)}")
-    
-    return output
 
 
-def combine_and_filter(bens_bites_data, ai_rundown_data):
-    """Combine articles from all sources and filter to last 24 hours"""
-    # Combine all articles
-    all_articles = []
-    all_articles.extend(bens_bites_data["articles"])
-    all_articles.extend(ai_rundown_data["articles"])
+def run_pipeline(scrape_many, output_dir):
+    """
+    Scrape every source, combine, and write the results once
     
-    # Deduplicate by URL
-    seen_urls = set()
-    unique_articles = []
-    for article in all_articles:
-        if article["url"] not in seen_urls:
-            seen_urls.add(article["url"])
-            unique_articles.append(article)
+    Args:
+        scrape_many: Function taking the list of source keys and returning
+            their outputs (or exceptions) in the same order
+        output_dir (str): Where articles.json and archive/ are written
     
-    # Add metadata
-    now = datetime.utcnow()
-    filtered_articles = []
+    Returns:
+        dict: Run summary
+    """
+    outputs = []
+    for key, output in zip(SOURCE_KEYS, scrape_many(SOURCE_KEYS)):
+        if isinstance(output, Exception):
+            output = failed_output(key, output)
+        outputs.append(output)
+        print(f"   ✓ {key}: {output['articlesFound']} articles")
+        if output["errors"]:
+            print(f"   ⚠️  {key}: {output['errors']}")
     
-    for article in unique_articles:
-        # Add unique ID
-        article["id"] = str(uuid.uuid4())
-        
-        # Add scraped timestamp
-        article["scrapedAt"] = now.isoformat() + "Z"
-        
-        # Determine source
-        if "bensbites" in article["url"]:
-            article["source"] = "bens_bites"
-        elif "therundown.ai" in article["url"]:
-            article["source"] = "ai_rundown"
-        
-        # Add save fields
-        article["saved"] = False
-        article["savedAt"] = None
-        
-        filtered_articles.append(article)
+    print("🔗 Combining and filtering...")
+    os.makedirs(output_dir, exist_ok=True)
+    with SimHashStore(os.path.join(output_dir, "near_dup.sqlite3")) as near_dups:
+        combined = combine_sources(outputs, near_dups=near_dups)
+    articles = filter_24h(TimeIndex(combined))
+    print(f"   ✓ Final count: {len(articles)} unique articles")
+    
+    output_path = os.path.join(output_dir, "articles.json")
+    write_json_array(output_path, (article.to_dict() for article in articles))
     
-    # Sort by URL (since we don't have publish dates)
-    filtered_articles.sort(key=lambda x: x["url"], reverse=True)
+    archive = ArticleArchive(os.path.join(output_dir, "archive"))
+    archive.append(combined)
+    archive.compact()
+    print(f"💾 Saved to {output_path}")
     
-    return filtered_articles
+    return {
+        "success": True,
+        "articles_count": len(articles),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "sources": {
+            key: sum(1 for article in articles if article.source == key)
+            for key in SOURCE_KEYS
+        },
+        "errors": {
+            output["source"]: output["errors"] for output in outputs if output["errors"]
+        }
+    }
+
+
+@app.function(
+    image=image,
+    timeout=SOURCE_TIMEOUT,
+    retries=1,
+)
+def scrape_source(key):
+    """Scrape a single source (fanned out with .map())"""
+    return scrape_one(key)
+
+
+def scrape_locally(keys):
+    """In-process counterpart of scrape_source.map(keys, return_exceptions=True)"""
+    def run(key):
+        try:
+            return scrape_source.local(key)
+        except Exception as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=max(len(keys), 1)) as executor:
+        return list(executor.map(run, keys))
 
 
 @app.function(
@@ -241,41 +188,20 @@ def scrape_newsletters():
     Scheduled function that scrapes newsletters every 24 hours
     """
     print(f"🚀 Starting scheduled scrape at {datetime.utcnow().isoformat()}Z")
+    print(f"📰 Scraping {len(SOURCE_KEYS)} sources in parallel...")
     
     try:
-        print("📰 Scraping Ben's Bites...")
-        bens_bites_data = scrape_bensbites()
-        print(f"   ✓ Found {bens_bites_data['articlesFound']} articles")
-        
-        print("📰 Scraping The AI Rundown...")
-        ai_rundown_data = scrape_airundown()
-        print(f"   ✓ Found {ai_rundown_data['articlesFound']} articles")
+        result = run_pipeline(
+            lambda keys: list(scrape_source.map(keys, return_exceptions=True)),
+            VOLUME_PATH
+        )
         
-        print("🔗 Combining and filtering...")
-        articles = combine_and_filter(bens_bites_data, ai_rundown_data)
-        print(f"   ✓ Final count: {len(articles)} unique articles")
-        
-        # Save to volume
-        output_path = f"{VOLUME_PATH}/articles.json"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=2, ensure_ascii=False)
-        
-        # Commit changes to volume
+        # Commit changes to volume (once per run)
         volume.commit()
         
-        print(f"💾 Saved to {output_path}")
         print(f"✅ Scraping complete!")
-        
-        return {
-            "success": True,
-            "articles_count": len(articles),
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "sources": {
-                "bens_bites": len([a for a in articles if a.get('source') == 'bens_bites']),
-                "ai_rundown": len([a for a in articles if a.get('source') == 'ai_rundown']),
-            }
-        }
-        
+        return result
+    
     except Exception as e:
         print(f"❌ Error during scraping: {str(e)}")
         import traceback
@@ -287,40 +213,179 @@ def scrape_newsletters():
         }
 
 
-@app.function(
-    image=image,
+@app.cls(
+    image=web_image,
     volumes={VOLUME_PATH: volume},
+    scaledown_window=600,  # Stay warm between readers
 )
-def get_latest_articles():
+class ArticleService:
     """
-    Function to retrieve the latest scraped articles from the volume
+    Serves the latest articles from a warm container
+    
+    The parsed article set and its query index (tools/article_index.py)
+    stay in memory between requests. At most every RELOAD_INTERVAL seconds
+    the volume is reloaded, and articles.json is parsed again only if it
+    changed. Each response is rendered and gzip-compressed once per data
+    version and query.
     """
-    output_path = f"{VOLUME_PATH}/articles.json"
     
-    try:
-        with open(output_path, 'r', encoding='utf-8') as f:
-            articles = json.load(f)
+    @modal.enter()
+    def setup(self):
+        self.lock = threading.Lock()
+        self.stamp = None
+        self.checked = 0.0
+        self.version = None
+        self.index = ArticleIndex([])
+        self.responses = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=24 * 3600)
+        self.refresh(force=True)
+    
+    def refresh(self, force=False):
+        """Pick up a newer articles.json from the volume (throttled)"""
+        if not force and time.monotonic() - self.checked < RELOAD_INTERVAL:
+            return
+        with self.lock:
+            if not force and time.monotonic() - self.checked < RELOAD_INTERVAL:
+                return
+            self.checked = time.monotonic()
+            try:
+                volume.reload()
+            except Exception as e:
+                print(f"⚠️  Volume reload failed: {e}")
+            try:
+                stat = os.stat(ARTICLES_FILE)
+            except OSError:
+                return
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self.stamp:
+                return
+            with open(ARTICLES_FILE, 'rb') as f:
+                body = f.read()
+            self.index = ArticleIndex(json.loads(body))
+            self.version = hashlib.sha256(body).hexdigest()[:16]
+            self.stamp = stamp
+            self.responses.clear()
+    
+    @modal.method()
+    def latest(self, source: Optional[str] = None, since: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Articles newest first, as {"success", "articles", "count"}
         
-        return {
-            "success": True,
-            "articles": articles,
-            "count": len(articles)
-        }
-    except FileNotFoundError:
-        return {
-            "success": False,
-            "error": "No articles found. Run scrape_newsletters first."
+        Pages through ArticleIndex.query, so the cost follows the articles
+        returned rather than the whole set. A bad `since` or `limit` gives
+        {"success": False, "status": 400, "error": ...}, as /api/articles does.
+        
+        Args:
+            source: Only this source
+            since: Only articles at or after this ISO 8601 timestamp
+            limit: At most this many (default: all)
+        """
+        self.refresh()
+        if self.version is None:
+            return {
+                "success": False,
+                "error": "No articles found. Run scrape_newsletters first."
+            }
+        
+        key = ("latest", self.version, source, since, limit)
+        result = self.responses.get(key)
+        if result is None:
+            articles = []
+            cursor = None
+            try:
+                while True:
+                    page = self.index.query(
+                        source=source, since=since, cursor=cursor,
+                        limit=min(limit - len(articles), MAX_LIMIT) if limit else MAX_LIMIT
+                    )
+                    articles.extend(page["articles"])
+                    cursor = page["nextCursor"]
+                    if not cursor or (limit and len(articles) >= limit):
+                        break
+            except ValueError as e:
+                return {"success": False, "status": 400, "error": str(e)}
+            result = {"success": True, "articles": articles, "count": len(articles)}
+            self.responses.set(key, result)
+        return result
+    
+    @modal.fastapi_endpoint(method="GET")
+    def articles(
+        self,
+        request: Request,
+        source: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+    ):
+        """
+        GET ?source=&since=&until=&limit=&cursor=&fields=title,url
+        
+        One page, newest first, as {"articles", "nextCursor", "total"}
+        (see ArticleIndex.query). Gzipped when the client accepts it, with
+        an ETag for conditional requests.
+        """
+        self.refresh()
+        key = ("page", self.version, source, since, until, limit, cursor, fields)
+        rendered = self.responses.get(key)
+        if rendered is None:
+            try:
+                data = self.index.query(
+                    source=source, since=since, until=until, cursor=cursor, limit=limit,
+                    fields=fields.split(',') if fields else None
+                )
+                status = 200
+            except ValueError as e:
+                data = {"error": str(e)}
+                status = 400
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            etag = hashlib.sha256(body).hexdigest()[:32]
+            rendered = (status, etag, body, gzip.compress(body, mtime=0))
+            self.responses.set(key, rendered)
+        
+        status, etag, body, gzipped = rendered
+        use_gzip = 'gzip' in accepted_encodings(request.headers.get('accept-encoding'))
+        etag = f'"{etag}-gzip"' if use_gzip else f'"{etag}"'
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            # Errors (bad cursor, bad date) must not be cached downstream
+            "Cache-Control": f"public, max-age={RELOAD_INTERVAL}" if status == 200 else "no-store",
         }
+        if status == 200 and etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            body = gzipped
+        return Response(content=body, status_code=status, media_type="application/json", headers=headers)
+
+
+def get_latest_articles(source=None, since=None, limit=None):
+    """
+    Latest articles from the deployed app, for callers outside Modal
+    
+    A client-side helper, not a Modal function: it calls the warm
+    ArticleService directly, so no extra container is started per call.
+    Needs Modal credentials and a deployed app (modal deploy modal_scraper.py).
+    """
+    service = modal.Cls.from_name(APP_NAME, "ArticleService")
+    return service().latest.remote(source=source, since=since, limit=limit)
 
 
 @app.local_entrypoint()
-def main():
+def main(local: bool = False):
     """
     Local entrypoint for manual testing
     Run with: modal run modal_scraper.py
+    
+    With --local, every function body runs in this process (via .local())
+    and writes to .tmp/modal/ instead of the volume.
     """
-    print("🧪 Running manual scrape...")
-    result = scrape_newsletters.remote()
+    if local:
+        print("🧪 Running scrape locally...")
+        result = run_pipeline(scrape_locally, os.path.join(".tmp", "modal"))
+    else:
+        print("🧪 Running manual scrape...")
+        result = scrape_newsletters.remote()
     print(f"\n📊 Result:")
     print(json.dumps(result, indent=2))
-
@@ -7,57 +7,178 @@ Runs all scrapers, combines sources, filters to 24h, and outputs to JSON
 import sys
 import os
 import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add tools directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'tools'))
 
-import scrape_bensbites
-import scrape_airundown
+from sources import SOURCES
 from filter_24h import filter_24h
-from combine_sources import combine_sources
+from time_index import TimeIndex
+from combine_sources import combine_sources, refresh_combined
+from enrich_articles import ArticleCache, enrich_articles
+from url_index import UrlIndex
+from near_dup import SimHashStore
+from archive import ArticleArchive
+from ndjson import write_json_array, write_ndjson
 
 
-def main():
+COMBINED_SNAPSHOT = os.path.join('.tmp', 'combined.json')
+
+# --incremental: new/changed articles not yet uploaded (the uploader marks
+# them as seen in the URL index once they are in Supabase)
+DELTA_PATH = os.path.join('.tmp', 'articles.delta.ndjson')
+
+
+def run_scrapers(sources, concurrent=True):
+    """
+    Run every registered scraper
+    
+    Args:
+        sources (list): Source registry entries (see tools/sources.py)
+        concurrent (bool): Fetch and parse all sources at the same time
+        
+    Returns:
+        list: Scraper outputs, in the same order as sources
+    """
+    if not concurrent:
+        return [source["scrape"]() for source in sources]
+    
+    # Scrapers are network-bound and catch their own errors,
+    # so a thread per source keeps wall-clock time at the slowest one
+    with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+        futures = [executor.submit(source["scrape"]) for source in sources]
+        return [future.result() for future in futures]
+
+
+def load_snapshot(path=COMBINED_SNAPSHOT):
+    """Load the last combined article list, or None if unavailable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main(concurrent=True, enrich=False, incremental=False, output_format='json', hours=24,
+         archive=True):
     """
     Main orchestration function
+    
+    Args:
+        concurrent (bool): Scrape all sources in parallel (default) or one by one
+        enrich (bool): Fetch article pages to fill in dates, descriptions and images
+        incremental (bool): Also write the articles in the window that are
+            new or changed since they were last uploaded (tracked in
+            .tmp/url_index.sqlite3) to .tmp/articles.delta.ndjson
+        output_format (str): 'json' (legacy array for the dashboard),
+            'ndjson' (streamable, one article per line) or 'both'
+        hours (float): Keep articles from this many hours back (default 24)
+        archive (bool): Append combined articles to the day-partitioned
+            history in .tmp/archive/
     """
     print("🚀 Starting AI Newsletter Scraper...")
     print(f"⏰ Timestamp: {datetime.utcnow().isoformat()}Z\n")
     
-    # Step 1: Scrape Ben's Bites
-    print("📰 Scraping Ben's Bites...")
-    bensbites_output = scrape_bensbites.scrape()
-    print(f"   ✓ Found {bensbites_output['articlesFound']} articles")
-    if bensbites_output['errors']:
-        print(f"   ⚠️  Errors: {bensbites_output['errors']}")
-    
-    # Step 2: Scrape The AI Rundown
-    print("\n📰 Scraping The AI Rundown...")
-    airundown_output = scrape_airundown.scrape()
-    print(f"   ✓ Found {airundown_output['articlesFound']} articles")
-    if airundown_output['errors']:
-        print(f"   ⚠️  Errors: {airundown_output['errors']}")
-    
-    # Step 3: Combine sources
+    # Step 1-2: Scrape every registered source
+    mode = "concurrently" if concurrent else "sequentially"
+    print(f"📰 Scraping {len(SOURCES)} sources {mode}...")
+    all_scraper_outputs = run_scrapers(SOURCES, concurrent=concurrent)
+    
+    for source, output in zip(SOURCES, all_scraper_outputs):
+        print(f"\n📰 {source['name']}")
+        print(f"   ✓ Found {output['articlesFound']} articles")
+        if output['errors']:
+            print(f"   ⚠️  Errors: {output['errors']}")
+    
+    # Optional: fetch each article page once (cached) for its real publish date
+    enrichment = None
+    article_cache = ArticleCache() if enrich else None
+    if enrich:
+        print("\n🔎 Enriching articles...")
+        enrichment = enrich_articles(
+            [article for output in all_scraper_outputs for article in output['articles']],
+            cache=article_cache
+        )
+        print(f"   ✓ Fetched {enrichment['fetched']}, cached {enrichment['cached']}")
+        if enrichment['errors']:
+            print(f"   ⚠️  Errors: {enrichment['errors']}")
+    
+    # Step 3: Combine sources (reuse last run's result if nothing changed)
     print("\n🔗 Combining sources...")
-    all_scraper_outputs = [bensbites_output, airundown_output]
-    combined_articles = combine_sources(all_scraper_outputs)
-    print(f"   ✓ Combined into {len(combined_articles)} unique articles")
+    unchanged = all(output.get('unchanged') for output in all_scraper_outputs)
+    previous = load_snapshot() if unchanged else None
     
-    # Step 4: Filter to 24 hours
-    print("\n⏳ Filtering to last 24 hours...")
-    filtered_articles = filter_24h(combined_articles)
-    print(f"   ✓ Filtered to {len(filtered_articles)} recent articles")
+    if previous is not None:
+        if enrich:
+            enrich_articles(previous, cache=article_cache)
+        combined_articles = refresh_combined(previous, all_scraper_outputs)
+        print(f"   ✓ No source changed, reused {len(combined_articles)} articles")
+    else:
+        unchanged = False
+        with SimHashStore() as near_dups:
+            combined_articles = combine_sources(all_scraper_outputs, near_dups=near_dups)
+        print(f"   ✓ Combined into {len(combined_articles)} unique articles")
+    
+    # Timestamps indexed once; every window query below reuses it
+    time_index = TimeIndex(combined_articles)
     
-    # Step 5: Save to .tmp/articles.json
-    output_path = os.path.join('.tmp', 'articles.json')
     os.makedirs('.tmp', exist_ok=True)
+    with open(COMBINED_SNAPSHOT, 'w', encoding='utf-8') as f:
+        json.dump([article.to_dict() for article in combined_articles], f, ensure_ascii=False)
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(filtered_articles, f, indent=2, ensure_ascii=False)
+    # Keep history past the filter window (nothing new when unchanged)
+    archived = 0
+    if archive and not unchanged and combined_articles:
+        article_archive = ArticleArchive()
+        archived = article_archive.append(combined_articles)
+        article_archive.compact()
+        print(f"   ✓ Archived {archived} new or changed articles ({len(article_archive.days())} days of history)")
     
-    print(f"\n💾 Saved to: {output_path}")
+    # Step 4: Filter to 24 hours (or --hours)
+    print(f"\n⏳ Filtering to last {hours:g} hours...")
+    filtered_articles = filter_24h(time_index, hours=hours)
+    print(f"   ✓ Filtered to {len(filtered_articles)} recent articles")
+    
+    # Incremental mode: find the delta against the persistent URL index.
+    # Only articles in the window are staged (nothing else gets written or
+    # uploaded, so nothing else could ever be marked); nothing counts as
+    # seen until it has been uploaded.
+    delta_urls = set()
+    if incremental:
+        print("\n🗂️  Checking URL index...")
+        window_urls = {article.url for article in filtered_articles}
+        with UrlIndex() as index:
+            for output in all_scraper_outputs:
+                in_window = [article for article in output['articles'] if article['url'] in window_urls]
+                delta = index.update(in_window, seen_at=output['scrapedAt'])
+                delta_urls.update(article['url'] for article in delta)
+                output['newArticles'] = len(delta)
+                # Staged by an earlier run, since aged out of the window
+                index.discard([article['url'] for article in output['articles']
+                               if article['url'] not in window_urls])
+            known = len(index)
+        print(f"   ✓ {len(delta_urls)} new or changed articles ({known} known)")
+    
+    # Step 5: Save to .tmp/articles.json and/or .tmp/articles.ndjson
+    output_paths = []
+    if output_format in ('json', 'both'):
+        output_paths.append(os.path.join('.tmp', 'articles.json'))
+        write_json_array(output_paths[-1], (article.to_dict() for article in filtered_articles))
+    if output_format in ('ndjson', 'both'):
+        output_paths.append(os.path.join('.tmp', 'articles.ndjson'))
+        write_ndjson(output_paths[-1], (article.to_dict() for article in filtered_articles))
+    output_path = output_paths[0]
+    # Written last, so the uploader picks it as the newest file
+    if incremental:
+        delta_articles = [article for article in filtered_articles if article.url in delta_urls]
+        write_ndjson(DELTA_PATH, (article.to_dict() for article in delta_articles))
+        output_paths.append(DELTA_PATH)
+        print(f"   ✓ {len(delta_articles)} new or changed articles to upload")
+    
+    print(f"\n💾 Saved to: {', '.join(output_paths)}")
     
     # Step 6: Create log file
     log_dir = os.path.join('.tmp', 'logs')
@@ -69,18 +190,22 @@ def main():
     log_data = {
         "timestamp": datetime.utcnow().isoformat() + "Z",
         "sources": {
-            "bens_bites": {
-                "found": bensbites_output['articlesFound'],
-                "errors": bensbites_output['errors']
-            },
-            "ai_rundown": {
-                "found": airundown_output['articlesFound'],
-                "errors": airundown_output['errors']
+            source["key"]: {
+                "found": output['articlesFound'],
+                "errors": output['errors'],
+                **({"new": output['newArticles']} if incremental else {})
             }
+            for source, output in zip(SOURCES, all_scraper_outputs)
         },
+        "unchanged": unchanged,
+        "incremental": incremental,
+        "enrichment": enrichment,
         "total_combined": len(combined_articles),
+        "archived": archived,
+        "window_hours": hours,
         "total_filtered": len(filtered_articles),
-        "output_path": output_path
+        "output_path": output_path,
+        "output_paths": output_paths
     }
     
     with open(log_path, 'w', encoding='utf-8') as f:
@@ -93,8 +218,25 @@ def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape AI newsletters")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Scrape sources one at a time instead of concurrently")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Fetch new article pages for publish dates, descriptions and images")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Also write articles not yet uploaded (new or changed) to .tmp/articles.delta.ndjson")
+    parser.add_argument("--format", choices=["json", "ndjson", "both"], default="json",
+                        help="Output .tmp/articles.json, .tmp/articles.ndjson, or both")
+    parser.add_argument("--hours", type=float, default=24,
+                        help="Keep articles from the last N hours (default 24)")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="Don't append this run to the .tmp/archive/ history")
+    args = parser.parse_args()
+    
     try:
-        articles = main()
+        articles = main(concurrent=not args.sequential, enrich=args.enrich,
+                        incremental=args.incremental, output_format=args.format,
+                        hours=args.hours, archive=not args.no_archive)
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ Error: {e}")
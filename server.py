@@ -2,35 +2,516 @@
 """
 Simple HTTP server for the AI Newsletter Dashboard
 Serves the dashboard and allows proper loading of .tmp/articles.json
+
+Requests are handled on a thread each. Text files (the dashboard assets
+and the articles JSON) are kept in memory with their gzip/brotli
+encodings, reloaded when the file changes on disk, and served with
+strong ETags so unchanged content costs a 304.
 """
 
+import argparse
+import asyncio
+import gzip
+import hashlib
 import http.server
-import socketserver
+import json
+import os
 import sys
+import threading
+import time
+from collections import deque
+from email.utils import formatdate
+from urllib.parse import parse_qs, unquote, urlparse
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+# Add tools directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+
+from archive import ArticleArchive
+from article_index import DEFAULT_LIMIT, ArticleIndex
+from negotiation import accepted_encodings, etag_matches
+from sync_manifest import row_hash
+from ttl_cache import TTLCache
 
 PORT = 8080
 
+ARTICLES_PATH = '/.tmp/articles.json'
+ARTICLES_FILE = os.path.join('.tmp', 'articles.json')
+
+# Static assets may be reused for this long without revalidating
+STATIC_MAX_AGE = int(os.getenv("SERVER_STATIC_MAX_AGE", "300"))
+
+# Files kept in memory (larger or binary files are streamed from disk)
+CACHEABLE_TYPES = ('.html', '.js', '.css', '.json', '.ndjson', '.svg', '.txt', '.md')
+MAX_CACHED_BYTES = 5 * 1024 * 1024
+
+# Not worth compressing below this
+MIN_COMPRESS_BYTES = 512
+
+# Rendered /api/articles responses, keyed by data version and query
+QUERY_CACHE_SIZE = 256
+QUERY_CACHE_TTL = 300
+
+# /api/stream (Server-Sent Events)
+WATCH_INTERVAL = float(os.getenv("SERVER_WATCH_INTERVAL", "2"))
+EVENT_BUFFER = 256       # Past events kept for Last-Event-ID resume
+KEEPALIVE_INTERVAL = 15  # Comment line so proxies don't drop idle streams
+SEND_TIMEOUT = 10        # Subscribers slower than this are dropped
+
+
+def compress(body):
+    """Available encodings of body, best first"""
+    encodings = {}
+    if len(body) < MIN_COMPRESS_BYTES:
+        return encodings
+    if brotli is not None:
+        encodings['br'] = brotli.compress(body)
+    encodings['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+    return encodings
+
+
+class Representation:
+    """One immutable version of a file's content"""
+    
+    def __init__(self, body, mtime, encodings=None):
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.encodings = compress(body) if encodings is None else encodings
+
+
+class CachedFile:
+    """
+    A file held in memory, reloaded when its mtime or size changes
+    
+    Readers always get a complete Representation; a reload swaps in a new
+    one, so requests in flight keep the version they started with.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.stamp = None
+        self.current = None
+    
+    def build(self, body, mtime):
+        return Representation(body, mtime)
+    
+    def get(self):
+        """
+        Current representation
+        
+        Raises:
+            OSError: File missing or unreadable
+        """
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self.stamp:
+            with self.lock:
+                if stamp != self.stamp:
+                    with open(self.path, 'rb') as f:
+                        body = f.read()
+                    self.current = self.build(body, stat.st_mtime)
+                    self.stamp = stamp
+        return self.current
+
+
+class ArticleSet(Representation):
+    """articles.json plus the query index built from it"""
+    
+    def __init__(self, body, mtime):
+        super().__init__(body, mtime)
+        try:
+            articles = json.loads(body)
+        except ValueError:
+            articles = []
+        self.index = ArticleIndex(articles)
+
+
+class ArticleStore(CachedFile):
+    """articles.json, parsed and indexed once per change on disk"""
+    
+    def build(self, body, mtime):
+        return ArticleSet(body, mtime)
+
+
+class ArticleFeed:
+    """
+    Pushes added and changed articles to Server-Sent Events subscribers
+    
+    Runs its own asyncio loop on a background thread. The HTTP handler
+    sends the response headers and then hands the socket over (see
+    DashboardServer.detach), so an idle subscriber costs a socket, not a
+    thread. The loop watches the ArticleStore; when articles.json changes
+    it diffs the new set against the last one (ignoring scrapedAt) and
+    broadcasts one event holding only the delta. The last EVENT_BUFFER
+    events are kept so a reconnecting client can resume from its
+    Last-Event-ID; if it fell further behind it gets a `reset` event and
+    should refetch /api/articles.
+    """
+    
+    def __init__(self, store, interval=WATCH_INTERVAL, buffer_size=EVENT_BUFFER):
+        self.store = store
+        self.interval = interval
+        self.events = deque(maxlen=buffer_size)  # (seq, encoded event)
+        # Event IDs are "<epoch>:<seq>"; IDs from an earlier process get a reset
+        self.epoch = format(int(time.time()), 'x')
+        self.seq = 0
+        self.hashes = None
+        self.subscribers = set()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name='article-feed', daemon=True)
+    
+    def start(self):
+        self.thread.start()
+    
+    def attach(self, sock, last_event_id=None):
+        """Take over a socket whose SSE response headers were already sent (thread-safe)"""
+        asyncio.run_coroutine_threadsafe(self._serve(sock, last_event_id), self.loop)
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.create_task(self._watch())
+        self.loop.create_task(self._keepalive())
+        self.loop.run_forever()
+    
+    def _diff(self, index):
+        """Delta payload against the previous article set, or None"""
+        # Keyed like the archive: articles without an ID fall back to their URL
+        hashes = {article.id or article.url: row_hash(article.to_row()) for article in index}
+        previous, self.hashes = self.hashes, hashes
+        if previous is None:
+            return None
+        changed = [
+            article.to_dict() for article in index
+            if previous.get(article.id or article.url) != hashes[article.id or article.url]
+        ]
+        removed = [key for key in previous if key not in hashes]
+        if not changed and not removed:
+            return None
+        return {"articles": changed, "removed": removed}
+    
+    async def _watch(self):
+        version = None
+        while True:
+            try:
+                # Reloading parses and indexes the file; keep that off the loop
+                article_set = await self.loop.run_in_executor(None, self.store.get)
+            except OSError:
+                article_set = None
+            if article_set is not None and article_set is not version:
+                version = article_set
+                payload = await self.loop.run_in_executor(None, self._diff, article_set.index)
+                if payload is not None:
+                    self._publish(payload)
+            await asyncio.sleep(self.interval)
+    
+    def _publish(self, payload):
+        self.seq += 1
+        data = json.dumps(payload, ensure_ascii=False)
+        event = f"id: {self.epoch}:{self.seq}\nevent: articles\ndata: {data}\n\n".encode('utf-8')
+        self.events.append((self.seq, event))
+        self._broadcast(event)
+    
+    def _broadcast(self, data):
+        for writer in list(self.subscribers):
+            self.loop.create_task(self._send(writer, data))
+    
+    async def _send(self, writer, data):
+        try:
+            writer.write(data)
+            await asyncio.wait_for(writer.drain(), SEND_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError, OSError):
+            self.subscribers.discard(writer)
+            writer.close()
+    
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            self._broadcast(b": keepalive\n\n")
+    
+    def _replay(self, last_event_id):
+        """Events a client resuming from last_event_id missed"""
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition(':')
+        try:
+            seq = int(seq)
+        except ValueError:
+            seq = -1
+        oldest = self.events[0][0] if self.events else self.seq + 1
+        if epoch != self.epoch or seq > self.seq or seq < oldest - 1:
+            return [f"id: {self.epoch}:{self.seq}\nevent: reset\ndata: {{}}\n\n".encode('utf-8')]
+        return [event for event_seq, event in self.events if event_seq > seq]
+    
+    async def _serve(self, sock, last_event_id):
+        sock.setblocking(False)
+        reader, writer = await asyncio.open_connection(sock=sock)
+        writer.write(b"retry: 5000\n\n")
+        for event in self._replay(last_event_id):
+            writer.write(event)
+        self.subscribers.add(writer)
+        try:
+            # Clients send nothing after the request; EOF means they left
+            while await reader.read(1024):
+                pass
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    files = {}
+    files_lock = threading.Lock()
+    articles = ArticleStore(ARTICLES_FILE)
+    archive = ArticleArchive()
+    query_cache = TTLCache(maxsize=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL)
+    
     def end_headers(self):
         # Allow CORS for local development
         self.send_header('Access-Control-Allow-Origin', '*')
         super().end_headers()
+    
+    def do_GET(self):
+        self.handle_request(head=False)
+    
+    def do_HEAD(self):
+        self.handle_request(head=True)
+    
+    def handle_request(self, head):
+        url = urlparse(self.path)
+        if url.path == '/api/archive':
+            return self.send_archive(parse_qs(url.query), head)
+        if url.path == '/api/stream':
+            return self.send_stream(parse_qs(url.query), head)
+        if url.path in ('/api/sources', '/api/articles') or url.path.startswith('/api/articles/'):
+            return self.send_articles_api(url, head)
+        
+        cached = self.cached_file(url.path)
+        if cached is not None:
+            try:
+                representation = cached.get()
+            except OSError:
+                self.send_error(404, "File not found")
+                return
+            if url.path == ARTICLES_PATH or url.path.endswith(('.html', '/')):
+                cache_control = 'no-cache'
+            else:
+                cache_control = f'public, max-age={STATIC_MAX_AGE}'
+            return self.send_representation(representation, self.guess_type(cached.path), cache_control, head)
+        
+        if head:
+            super().do_HEAD()
+        else:
+            super().do_GET()
+    
+    def cached_file(self, url_path):
+        """CachedFile for a small text file under the served directory, else None"""
+        if url_path == ARTICLES_PATH:
+            return self.articles
+        path = self.translate_path(unquote(url_path))
+        if url_path.endswith('/') and os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        if not path.endswith(CACHEABLE_TYPES):
+            return None
+        try:
+            if not os.path.isfile(path) or os.path.getsize(path) > MAX_CACHED_BYTES:
+                return None
+        except OSError:
+            return None
+        
+        with self.files_lock:
+            cached = self.files.get(path)
+            if cached is None:
+                cached = self.files[path] = CachedFile(path)
+        return cached
+    
+    def send_representation(self, representation, content_type, cache_control, head=False):
+        """Send a body in the best accepted encoding, or 304 if the client's copy matches"""
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+        encoding = next((name for name in representation.encodings if name in accepted), None)
+        body = representation.encodings[encoding] if encoding else representation.body
+        # Strong ETags are per encoding (the bytes differ)
+        etag = f'"{representation.etag}-{encoding}"' if encoding else f'"{representation.etag}"'
+        
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', representation.last_modified)
+        self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+    
+    def send_json(self, data, head=False):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        representation = Representation(body, None)
+        self.send_representation(representation, 'application/json; charset=utf-8', 'no-cache', head)
+    
+    def send_articles_api(self, url, head=False):
+        """
+        Query the current articles.json
+        
+        /api/articles?source=&since=&until=&limit=&cursor=&fields=title,url
+            One page, newest first; pass nextCursor back as cursor
+        /api/articles/<id>
+            One article
+        /api/sources
+            Article count per source
+        """
+        try:
+            article_set = self.articles.get()
+        except OSError:
+            self.send_error(404, "No articles yet, run scrape_all.py first")
+            return
+        
+        # Same data version + same query = same bytes, so reuse the encoded body
+        key = (article_set.etag, url.path, url.query)
+        representation = self.query_cache.get(key)
+        if representation is None:
+            index = article_set.index
+            params = parse_qs(url.query)
+            
+            def param(name):
+                return params.get(name, [None])[0]
+            
+            if url.path == '/api/sources':
+                data = {"sources": index.source_counts(), "total": len(index)}
+            elif url.path in ('/api/articles', '/api/articles/'):
+                fields = param('fields')
+                try:
+                    data = index.query(
+                        source=param('source'),
+                        since=param('since'),
+                        until=param('until'),
+                        cursor=param('cursor'),
+                        limit=param('limit') or DEFAULT_LIMIT,
+                        fields=fields.split(',') if fields else None
+                    )
+                except ValueError as e:
+                    self.send_error(400, str(e))
+                    return
+            else:
+                article = index.get(unquote(url.path[len('/api/articles/'):]))
+                if article is None:
+                    self.send_error(404, "Article not found")
+                    return
+                data = article.to_dict()
+            
+            body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            representation = Representation(body, None)
+            self.query_cache.set(key, representation)
+        
+        self.send_representation(representation, 'application/json; charset=utf-8', 'no-cache', head)
+    
+    def send_stream(self, params, head=False):
+        """
+        /api/stream: Server-Sent Events of new and changed articles
+        
+        Each `articles` event carries {"articles": [...], "removed": [ids]}
+        (the URL stands in for a missing ID). Resume with the Last-Event-ID
+        header (or ?lastEventId=). HEAD gets the headers and no stream.
+        """
+        feed = self.server.feed
+        if feed is None:
+            self.send_error(503, "Live updates are not enabled")
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        if head:
+            self.end_headers()
+            return
+        self.end_headers()
+        self.wfile.flush()
+        self.close_connection = True
+        
+        last_event_id = self.headers.get('Last-Event-ID') or params.get('lastEventId', [None])[0]
+        # The feed's event loop owns the socket from here on
+        self.server.detach(self.request)
+        feed.attach(self.request, last_event_id)
+    
+    def send_archive(self, params, head=False):
+        """History beyond the 24h window: /api/archive?since=...&until=...&source=..."""
+        def param(name):
+            return params.get(name, [None])[0]
+        
+        # One instance; its manifest is re-read only when the file changes
+        self.archive.reload()
+        try:
+            articles = self.archive.query(param('since'), param('until'), param('source'))
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        
+        self.send_json([article.to_dict() for article in articles], head)
+
+
+class DashboardServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, server_address, handler_class, feed=None):
+        super().__init__(server_address, handler_class)
+        self.feed = feed
+        self.detached = set()
+        self.detached_lock = threading.Lock()
+    
+    def detach(self, request):
+        """Keep a request's socket open after its handler returns"""
+        with self.detached_lock:
+            self.detached.add(request)
+    
+    def shutdown_request(self, request):
+        with self.detached_lock:
+            if request in self.detached:
+                self.detached.discard(request)
+                return
+        super().shutdown_request(request)
+
 
-def main():
+def main(port=PORT):
     Handler = MyHTTPRequestHandler
     
     print(f"🚀 Starting AI Newsletter Dashboard Server...")
-    print(f"📡 Server running at: http://localhost:{PORT}")
-    print(f"🌐 Open your browser to: http://localhost:{PORT}")
+    print(f"📡 Server running at: http://localhost:{port}")
+    print(f"🌐 Open your browser to: http://localhost:{port}")
     print(f"\n💡 Tip: Make sure you've run 'python3 scrape_all.py' to load articles")
     print(f"⛔ Press Ctrl+C to stop the server\n")
     
     try:
-        with socketserver.TCPServer(("", PORT), Handler) as httpd:
+        feed = ArticleFeed(Handler.articles)
+        feed.start()
+        with DashboardServer(("", port), Handler, feed=feed) as httpd:
             httpd.serve_forever()
     except KeyboardInterrupt:
         print("\n\n👋 Server stopped. Goodbye!")
         sys.exit(0)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Serve the AI Newsletter Dashboard")
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port to listen on (default {PORT})")
+    args = parser.parse_args()
+    main(port=args.port)
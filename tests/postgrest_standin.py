@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+PostgREST Stand-in
+In-memory, threaded HTTP server that answers the subset of the PostgREST
+API the Supabase clients use, so they can be exercised without a project
+
+Supports the articles and saved_articles tables with:
+    - POST upserts (on_conflict=, Prefer: resolution=merge-duplicates,
+      return=minimal / return=representation)
+    - select= (columns, or "*, articles(*)" to embed the saved article)
+    - order=, limit=, eq./gte./gt./lte./lt. filters, and or=(...) / and(...)
+      groups (the keyset cursor iter_articles sends)
+
+Usage:
+    with PostgrestStandIn() as server:
+        client = SupabaseClient(url=server.url, key="test")
+        server.fail_next = [503]   # next POST answers 503 (to test retries)
+        server.malformed_next = 1  # next POST succeeds but answers invalid JSON
+"""
+
+import json
+import re
+import threading
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+OPERATORS = {
+    'eq': lambda a, b: a == b,
+    'gt': lambda a, b: a is not None and a > b,
+    'gte': lambda a, b: a is not None and a >= b,
+    'lt': lambda a, b: a is not None and a < b,
+    'lte': lambda a, b: a is not None and a <= b,
+}
+
+CONDITION_RE = re.compile(r'([a-z_]+)\.([a-z]+)\.("(?:[^"\\]|\\.)*"|[^,()]*)')
+
+
+def _split_top_level(text):
+    """Split "a,and(b,c),d" on commas outside parentheses and quotes"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _condition(text):
+    """Predicate for one PostgREST condition or logic group"""
+    for logic, combine in (('or', any), ('and', all)):
+        if text.startswith(logic + '(') and text.endswith(')'):
+            predicates = [_condition(part) for part in _split_top_level(text[len(logic) + 1:-1])]
+            return lambda row: combine(predicate(row) for predicate in predicates)
+    
+    match = CONDITION_RE.fullmatch(text)
+    if match is None or match.group(2) not in OPERATORS:
+        raise ValueError(f"Unsupported filter: {text}")
+    column, operator, value = match.groups()
+    if value.startswith('"'):
+        value = json.loads(value)
+    compare = OPERATORS[operator]
+    return lambda row: compare(row.get(column), value)
+
+
+class PostgrestStandIn:
+    """In-memory PostgREST-compatible server on an ephemeral local port"""
+    
+    def __init__(self):
+        self.tables = {"articles": [], "saved_articles": []}
+        self.lock = threading.Lock()
+        # Status codes to answer the next POSTs with, instead of handling them
+        self.fail_next = []
+        # POSTs to store normally but answer with a body that isn't JSON
+        self.malformed_next = 0
+        self.requests = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.thread = None
+    
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def upsert(self, table, rows, on_conflict=None):
+        """Insert rows, merging into existing ones that share on_conflict"""
+        now = datetime.utcnow().isoformat() + 'Z'
+        stored = []
+        with self.lock:
+            existing = self.tables[table]
+            for row in rows:
+                match = None
+                if on_conflict:
+                    match = next((r for r in existing if r.get(on_conflict) == row.get(on_conflict)), None)
+                if match is None:
+                    match = {"id": str(uuid.uuid4())}
+                    if table == "saved_articles":
+                        match["saved_at"] = now
+                    existing.append(match)
+                match.update(row)
+                stored.append(dict(match))
+        return stored
+    
+    def select(self, table, params):
+        """Rows of a table filtered, ordered, limited and projected per params"""
+        predicates = []
+        order, limit, select = [], None, '*'
+        for name, value in params:
+            if name == 'select':
+                select = value
+            elif name == 'order':
+                order = [item.split('.') for item in value.split(',')]
+            elif name == 'limit':
+                limit = int(value)
+            elif name == 'on_conflict':
+                continue
+            elif name in ('or', 'and'):
+                predicates.append(_condition(f"{name}{value}"))
+            else:
+                predicates.append(_condition(f"{name}.{value}"))
+        
+        with self.lock:
+            rows = [dict(row) for row in self.tables[table] if all(p(row) for p in predicates)]
+            articles = {row["id"]: row for row in self.tables["articles"]}
+        
+        for column, direction in reversed(order):
+            rows.sort(key=lambda row: (row.get(column) is not None, row.get(column) or ''),
+                      reverse=direction == 'desc')
+        if limit is not None:
+            rows = rows[:limit]
+        
+        columns = [column.strip() for column in select.split(',')]
+        for row in rows:
+            if 'articles(*)' in columns:
+                article = articles.get(row.get("article_id"))
+                row["articles"] = dict(article) if article else None
+        if '*' not in columns:
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+        return rows
+    
+    def _handler(self):
+        standin = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+            
+            def _table(self):
+                path = urlsplit(self.path).path
+                prefix = '/rest/v1/'
+                table = path[len(prefix):] if path.startswith(prefix) else None
+                return table if table in standin.tables else None
+            
+            def _params(self):
+                return parse_qsl(urlsplit(self.path).query, keep_blank_values=True)
+            
+            def _send(self, status, body=None):
+                payload = b'' if body is None else json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            
+            def do_GET(self):
+                table = self._table()
+                standin.requests.append(('GET', self.path))
+                if table is None:
+                    self._send(404, {"message": "Not found"})
+                    return
+                try:
+                    self._send(200, standin.select(table, self._params()))
+                except ValueError as e:
+                    self._send(400, {"message": str(e)})
+            
+            def do_POST(self):
+                table = self._table()
+                standin.requests.append(('POST', self.path))
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if standin.fail_next:
+                    self._send(standin.fail_next.pop(0), {"message": "Injected failure"})
+                    return
+                if table is None:
+                    self._send(404, {"message": "Not found"})
+                    return
+                rows = json.loads(body or b'[]')
+                rows = rows if isinstance(rows, list) else [rows]
+                on_conflict = dict(self._params()).get('on_conflict')
+                stored = standin.upsert(table, rows, on_conflict)
+                if standin.malformed_next:
+                    standin.malformed_next -= 1
+                    payload = b'[{"id": '
+                    self.send_response(201)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                elif 'return=representation' in self.headers.get('Prefer', ''):
+                    self._send(201, stored)
+                else:
+                    self._send(201)
+        
+        return Handler
+
+
+if __name__ == "__main__":
+    import time
+    
+    with PostgrestStandIn() as server:
+        print(f"PostgREST stand-in listening on {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
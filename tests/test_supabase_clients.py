@@ -0,0 +1,151 @@
+"""
+Supabase clients against the in-memory PostgREST stand-in
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'tools'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import async_supabase_client
+import supabase_client
+from article import Article
+from async_supabase_client import AsyncSupabaseClient
+from postgrest_standin import PostgrestStandIn
+from supabase_client import SupabaseClient
+
+
+def make_articles(count, title="Story"):
+    return [
+        Article(
+            f"https://www.bensbites.com/p/story-{i}",
+            f"{title} {i}",
+            source="bens_bites" if i % 2 else "ai_rundown",
+            id=f"article-{i}",
+            # Pairs share a scraped_at so paging has to break ties on id
+            scraped_at=f"2026-02-08T{10 + i // 2:02d}:00:00Z",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    # Retries shouldn't slow the tests down
+    monkeypatch.setattr(supabase_client, "UPSERT_BACKOFF", 0.01)
+    monkeypatch.setattr(async_supabase_client, "UPSERT_BACKOFF", 0.01)
+    with PostgrestStandIn() as standin:
+        yield standin
+
+
+def test_async_insert_articles_batches_retries_and_upserts(server):
+    async def run():
+        async with AsyncSupabaseClient(url=server.url, key="test") as client:
+            server.fail_next = [503]
+            first = await client.insert_articles(make_articles(7), batch_size=3)
+            again = await client.insert_articles(make_articles(7, title="Updated"), batch_size=3,
+                                                 return_rows=True)
+            return first, again
+    
+    first, again = asyncio.run(run())
+    
+    assert first["success"] and first["count"] == 7 and first["failed"] == 0
+    assert [batch["size"] for batch in first["batches"]] == [3, 3, 1]
+    assert sum(batch["attempts"] for batch in first["batches"]) == 4
+    assert again["count"] == 7
+    assert len(server.tables["articles"]) == 7
+    assert {row["title"] for row in server.tables["articles"]} == {f"Updated {i}" for i in range(7)}
+
+
+def test_async_insert_articles_reports_failed_batches(server):
+    async def run():
+        async with AsyncSupabaseClient(url=server.url, key="test") as client:
+            server.fail_next = [400]
+            return await client.insert_articles(make_articles(4), batch_size=2, max_retries=0)
+    
+    result = asyncio.run(run())
+    
+    assert not result["success"]
+    assert result["count"] == 2 and result["failed"] == 2
+    assert "HTTP 400" in result["error"]
+
+
+def test_clients_report_a_malformed_response_as_a_failed_batch(server):
+    async def run():
+        async with AsyncSupabaseClient(url=server.url, key="test") as client:
+            server.malformed_next = 1
+            return await client.insert_articles(make_articles(4), batch_size=2, max_retries=0,
+                                                return_rows=True)
+    
+    result = asyncio.run(run())
+    
+    server.malformed_next = 1
+    sync_result = SupabaseClient(url=server.url, key="test").insert_articles(
+        make_articles(4), batch_size=2, max_retries=0, return_rows=True
+    )
+    
+    for outcome in (result, sync_result):
+        assert not outcome["success"]
+        assert outcome["count"] == 2 and outcome["failed"] == 2
+        assert [batch["success"] for batch in outcome["batches"]].count(False) == 1
+
+
+def test_iter_articles_pages_with_keyset_cursor(server):
+    SupabaseClient(url=server.url, key="test").insert_articles(make_articles(9))
+    expected = sorted(server.tables["articles"], key=lambda row: (row["scraped_at"], row["id"]), reverse=True)
+    
+    async def collect(**kwargs):
+        async with AsyncSupabaseClient(url=server.url, key="test") as client:
+            return [row async for row in client.iter_articles(**kwargs)]
+    
+    rows = asyncio.run(collect(columns=["title"], page_size=2))
+    assert rows == [{"title": row["title"]} for row in expected]
+    
+    sync_rows = list(SupabaseClient(url=server.url, key="test").iter_articles(columns=["title"], page_size=2))
+    assert sync_rows == rows
+    
+    recent = asyncio.run(collect(source="bens_bites", since="2026-02-08T12:00:00Z", page_size=1))
+    assert [row["title"] for row in recent] == [
+        row["title"] for row in expected
+        if row["source"] == "bens_bites" and row["scraped_at"] >= "2026-02-08T12:00:00Z"
+    ]
+
+
+def test_get_saved_articles_embeds_articles(server):
+    SupabaseClient(url=server.url, key="test").insert_articles(make_articles(3))
+    ids = [row["id"] for row in server.tables["articles"]]
+    
+    async def run():
+        async with AsyncSupabaseClient(url=server.url, key="test") as client:
+            saved = await client.save_articles(ids[:2], user_id="user-1")
+            await client.save_article(ids[2], user_id="user-2")
+            return saved, await client.get_saved_articles(user_id="user-1")
+    
+    saved, result = asyncio.run(run())
+    
+    assert all(item["success"] for item in saved)
+    assert result["success"] and result["count"] == 2
+    assert {item["articles"]["id"] for item in result["saved_articles"]} == set(ids[:2])
+
+
+def test_get_saved_articles_cache_is_not_shared_with_callers(server):
+    client = SupabaseClient(url=server.url, key="test")
+    client.insert_articles(make_articles(2))
+    client.save_article(server.tables["articles"][0]["id"], user_id="user-1")
+    
+    first = client.get_saved_articles(user_id="user-1")
+    first["saved_articles"][0]["articles"]["title"] = "Mutated"
+    first["saved_articles"].clear()
+    cached = client.get_saved_articles(user_id="user-1")
+    cached["saved_articles"].append({})
+    
+    again = client.get_saved_articles(user_id="user-1")
+    assert again["count"] == 1 and len(again["saved_articles"]) == 1
+    assert again["saved_articles"][0]["articles"]["title"] == "Story 0"
+    assert sum(1 for method, _ in server.requests if method == 'GET') == 1
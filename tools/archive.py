@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Article Archive
+Day-partitioned, append-only NDJSON store of every article ever scraped
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+
+from article import Article, format_timestamp, parse_timestamp
+from ndjson import iter_ndjson, write_ndjson
+from url_index import UrlIndex, content_hash
+
+
+ARCHIVE_DIR = os.path.join('.tmp', 'archive')
+MANIFEST_NAME = 'manifest.json'
+# What has been archived (url -> content hash, first seen), see url_index
+INDEX_NAME = 'urls.sqlite3'
+
+# Days with at least this many shards are merged by compact()
+COMPACT_MIN_SHARDS = 8
+
+
+def _day(article, first_seen=None):
+    """
+    UTC partition day of an article
+    
+    Publish time, or for undated articles the time the archive first saw
+    them, so every later copy lands in the same day (and compacts away).
+    """
+    timestamp = article.published_at or parse_timestamp(first_seen) or article.timestamp or datetime.now(timezone.utc)
+    return timestamp.strftime('%Y-%m-%d')
+
+
+class ArticleArchive:
+    """
+    Append-only article history partitioned by day
+    
+    Layout: <path>/YYYY-MM-DD/part-NNNNN.ndjson, one shard per append per
+    day, plus <path>/manifest.json recording each shard's min/max timestamp
+    and row count. Range queries read only the shards whose [min, max]
+    overlaps the range. append() writes only articles that are new or
+    changed since they were last archived (tracked in <path>/urls.sqlite3).
+    A changed article is written again, to the day it now falls on; reads
+    keep the copy urls.sqlite3 last recorded (else the most recently
+    written one), and compact() drops older copies within a day.
+    """
+    
+    def __init__(self, path=ARCHIVE_DIR):
+        self.path = path
+        self.manifest_path = os.path.join(path, MANIFEST_NAME)
+        self.stamp = None
+        self.shards = []
+        self.reload()
+    
+    def _manifest_stamp(self):
+        try:
+            stat = os.stat(self.manifest_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def reload(self):
+        """
+        Re-read manifest.json if it changed on disk since it was last read
+        
+        Returns:
+            bool: True if the shard list was reloaded
+        """
+        stamp = self._manifest_stamp()
+        if stamp == self.stamp:
+            return False
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                shards = json.load(f)["shards"]
+        except (OSError, ValueError, KeyError):
+            shards = []
+        # Swapped in whole, so a query in flight keeps the list it started with
+        self.shards = shards
+        self.stamp = stamp
+        return True
+    
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"shards": self.shards}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        self.stamp = self._manifest_stamp()
+    
+    def __len__(self):
+        """Rows stored (including superseded copies until compaction)"""
+        return sum(shard["rows"] for shard in self.shards)
+    
+    def days(self):
+        return sorted({shard["day"] for shard in self.shards})
+    
+    def _next_shard_path(self, day):
+        taken = [shard["path"] for shard in self.shards if shard["day"] == day]
+        number = 1 + max((int(p.rsplit('-', 1)[1].split('.')[0]) for p in taken), default=0)
+        return f"{day}/part-{number:05d}.ndjson"
+    
+    def _write_shard(self, day, articles):
+        """Write one shard file and return its manifest entry"""
+        shard_path = self._next_shard_path(day)
+        write_ndjson(os.path.join(self.path, shard_path), (article.to_dict() for article in articles))
+        timestamps = [article.timestamp for article in articles if article.timestamp]
+        entry = {
+            "path": shard_path,
+            "day": day,
+            "min": format_timestamp(min(timestamps)) if timestamps else None,
+            "max": format_timestamp(max(timestamps)) if timestamps else None,
+            "rows": len(articles)
+        }
+        self.shards.append(entry)
+        return entry
+    
+    def append(self, articles):
+        """
+        Add the new or changed articles, one new shard per day they fall on
+        
+        Args:
+            articles (list): Article objects (or article dictionaries)
+        
+        Returns:
+            int: Articles written (unchanged ones are skipped)
+        """
+        articles = [Article.coerce(article) for article in articles]
+        os.makedirs(self.path, exist_ok=True)
+        with UrlIndex(os.path.join(self.path, INDEX_NAME)) as index:
+            scraped = [article.scraped_at for article in articles if article.scraped_at]
+            seen_at = format_timestamp(max(scraped)) if scraped else None
+            delta = index.update([article.to_dict() for article in articles], seen_at=seen_at)
+            changed = {data["url"] for data in delta}
+            first_seen = index.first_seen(changed)
+            
+            by_day = {}
+            for article in articles:
+                # Articles without a URL can't be tracked, so are always written
+                if article.url and article.url not in changed:
+                    continue
+                changed.discard(article.url)
+                by_day.setdefault(_day(article, first_seen.get(article.url)), []).append(article)
+            
+            for day, day_articles in sorted(by_day.items()):
+                self._write_shard(day, day_articles)
+            if by_day:
+                self.save()
+            index.mark(delta, seen_at=seen_at)
+        return sum(len(day_articles) for day_articles in by_day.values())
+    
+    def _overlapping(self, start, end):
+        for shard in self.shards:
+            if shard["min"] is None:
+                yield shard
+                continue
+            if start is not None and parse_timestamp(shard["max"]) < start:
+                continue
+            if end is not None and parse_timestamp(shard["min"]) >= end:
+                continue
+            yield shard
+    
+    def query(self, since=None, until=None, source=None):
+        """
+        Articles with since <= timestamp < until
+        
+        Args:
+            since (datetime or str): Inclusive start (None = unbounded)
+            until (datetime or str): Exclusive end (None = unbounded)
+            source (str): Only this source
+        
+        Returns:
+            list: Article objects, newest first, one per article ID
+        """
+        start = parse_timestamp(since)
+        end = parse_timestamp(until)
+        if (since and start is None) or (until and end is None):
+            raise ValueError(f"Invalid time range: {since!r} to {until!r}")
+        
+        # Every copy in the candidate shards, in write order
+        copies = {}
+        for shard in self._overlapping(start, end):
+            for data in iter_ndjson(os.path.join(self.path, shard["path"])):
+                article = Article.from_dict(data)
+                copies.setdefault(article.id or article.url, []).append((content_hash(data), article))
+        current = self._current_hashes(versions[-1][1].url for versions in copies.values())
+        
+        # Dedup first, then filter: an older copy still in range must not
+        # stand in for an edit that moved the article out of it
+        articles = []
+        for versions in copies.values():
+            expected = current.get(versions[-1][1].url)
+            if expected is None:
+                article = versions[-1][1]
+            else:
+                article = next((article for digest, article in reversed(versions) if digest == expected), None)
+                if article is None:
+                    # The current copy is in a shard outside the range
+                    continue
+            timestamp = article.timestamp
+            if timestamp is not None:
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp >= end:
+                    continue
+            if source is not None and article.source != source:
+                continue
+            articles.append(article)
+        
+        articles.sort(key=lambda x: x.timestamp or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+        return articles
+    
+    def _current_hashes(self, urls):
+        """Content hash of the last archived copy of each URL (see append)"""
+        index_path = os.path.join(self.path, INDEX_NAME)
+        if not os.path.exists(index_path):
+            return {}
+        with UrlIndex(index_path) as index:
+            return index.content_hashes(url for url in urls if url)
+    
+    def compact(self, min_shards=COMPACT_MIN_SHARDS):
+        """
+        Merge each day's shards into one, keeping the latest copy of each article
+        
+        Args:
+            min_shards (int): Only compact days with at least this many shards
+        
+        Returns:
+            int: Days compacted
+        """
+        compacted = 0
+        for day in self.days():
+            old = [shard for shard in self.shards if shard["day"] == day]
+            if len(old) < max(min_shards, 2):
+                continue
+            
+            latest = {}
+            for shard in old:
+                for data in iter_ndjson(os.path.join(self.path, shard["path"])):
+                    article = Article.from_dict(data)
+                    latest[article.id or article.url] = article
+            
+            # New shard and manifest first, so a crash never loses rows
+            self._write_shard(day, list(latest.values()))
+            self.shards = [shard for shard in self.shards if shard not in old]
+            self.save()
+            for shard in old:
+                try:
+                    os.remove(os.path.join(self.path, shard["path"]))
+                except OSError:
+                    pass
+            compacted += 1
+        return compacted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query or compact the local article archive")
+    parser.add_argument("--path", default=ARCHIVE_DIR, help="Archive directory")
+    parser.add_argument("--since", help="Start timestamp (ISO 8601)")
+    parser.add_argument("--until", help="End timestamp (ISO 8601)")
+    parser.add_argument("--source", help="Only this source")
+    parser.add_argument("--compact", action="store_true", help="Merge each day's shards into one")
+    args = parser.parse_args()
+    
+    archive = ArticleArchive(args.path)
+    if args.compact:
+        days = archive.compact(min_shards=2)
+        print(f"Compacted {days} day(s), {len(archive.shards)} shard(s) remain")
+    else:
+        articles = archive.query(args.since, args.until, args.source)
+        print(f"{len(articles)} article(s) in {len(archive.days())} day(s) archived")
+        for article in articles:
+            print(f"{article.published_str or '-':<28} {article.source or '-':<12} {article.title}")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Article Model
+Compact slotted article type shared by combine, filter, storage and upload
+"""
+
+import sys
+from datetime import datetime, timezone
+
+
+def parse_timestamp(value):
+    """
+    Parse an ISO 8601 timestamp into an aware UTC datetime
+    
+    Naive timestamps are taken as UTC (the pipeline writes UTC with a 'Z').
+    
+    Args:
+        value (str or datetime): Timestamp
+        
+    Returns:
+        datetime or None: None if value is empty or unparseable
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        text = value.strip()
+        if text[-1:] in ('Z', 'z'):
+            text = text[:-1] + '+00:00'
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def format_timestamp(value):
+    """Format a datetime as the pipeline's UTC string, e.g. '2026-02-08T12:00:00Z'"""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(tzinfo=None).isoformat() + 'Z'
+
+
+def _intern(value):
+    # source/category repeat across every article; share one string object
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Article:
+    """
+    One article as it moves through the pipeline
+    
+    Timestamps are parsed once into aware UTC datetimes. A publish date the
+    scraper found but could not parse is kept verbatim in published_raw so
+    nothing is lost on output.
+    """
+    
+    __slots__ = (
+        'id', 'title', 'description', 'url', 'source',
+        'published_at', 'published_raw', 'scraped_at',
+        'image_url', 'category', 'cluster_id', 'saved', 'saved_at'
+    )
+    
+    def __init__(self, url, title='Untitled', description=None, source=None,
+                 published_at=None, scraped_at=None, image_url=None, category=None,
+                 id=None, cluster_id=None, saved=False, saved_at=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.url = url
+        self.source = _intern(source)
+        self.published_raw = None
+        self.published_at = parse_timestamp(published_at)
+        if self.published_at is None and published_at and not isinstance(published_at, datetime):
+            self.published_raw = published_at
+        self.scraped_at = parse_timestamp(scraped_at)
+        self.image_url = image_url
+        self.category = _intern(category)
+        self.cluster_id = cluster_id
+        self.saved = saved
+        self.saved_at = parse_timestamp(saved_at)
+    
+    @property
+    def timestamp(self):
+        """
+        Publish time, falling back to scrape time when none was given
+        
+        None if neither is known, or if the publish date could not be
+        parsed: such articles are undated for filter_24h and the query
+        indexes alike, not placed by when they were scraped.
+        """
+        if self.published_raw:
+            return None
+        return self.published_at or self.scraped_at
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build from the camelCase JSON format (articles.json / scraper output)"""
+        return cls(
+            url=data.get('url'),
+            title=data.get('title', 'Untitled'),
+            description=data.get('description'),
+            source=data.get('source'),
+            published_at=data.get('publishedAt'),
+            scraped_at=data.get('scrapedAt'),
+            image_url=data.get('imageUrl'),
+            category=data.get('category'),
+            id=data.get('id'),
+            cluster_id=data.get('clusterId'),
+            saved=data.get('saved', False),
+            saved_at=data.get('savedAt')
+        )
+    
+    @classmethod
+    def from_row(cls, row):
+        """Build from an `articles` table row (snake_case)"""
+        return cls(
+            url=row.get('url'),
+            title=row.get('title', 'Untitled'),
+            description=row.get('description'),
+            source=row.get('source'),
+            published_at=row.get('published_at'),
+            scraped_at=row.get('scraped_at'),
+            image_url=row.get('image_url'),
+            category=row.get('category'),
+            id=row.get('article_id')
+        )
+    
+    @classmethod
+    def coerce(cls, value):
+        """Accept an Article or a camelCase dict"""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+    
+    @property
+    def published_str(self):
+        return format_timestamp(self.published_at) if self.published_at else self.published_raw
+    
+    def to_dict(self):
+        """camelCase JSON format used by articles.json and the dashboard"""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "source": self.source,
+            "publishedAt": self.published_str,
+            "scrapedAt": format_timestamp(self.scraped_at),
+            "imageUrl": self.image_url,
+            "category": self.category,
+            "clusterId": self.cluster_id,
+            "saved": self.saved,
+            "savedAt": format_timestamp(self.saved_at)
+        }
+    
+    def to_row(self):
+        """snake_case row for the Supabase `articles` table"""
+        return {
+            "article_id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "published_at": self.published_str,
+            "scraped_at": format_timestamp(self.scraped_at) or datetime.utcnow().isoformat() + "Z",
+            "image_url": self.image_url,
+            "category": self.category,
+            "source": self.source
+        }
+    
+    def __eq__(self, other):
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"Article(id={self.id!r}, source={self.source!r}, url={self.url!r})"
+
+
+if __name__ == "__main__":
+    # Round-trip a sample article through each wire format
+    article = Article.from_dict({
+        "url": "https://www.bensbites.com/p/example",
+        "title": "Example",
+        "source": "bens_bites",
+        "publishedAt": "2026-02-08T13:30:00+01:00",
+        "scrapedAt": "2026-02-08T20:00:00Z"
+    })
+    print(article.to_dict())
+    print(article.to_row())
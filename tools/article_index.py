@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Article Query Index
+In-memory, newest-first index for paginated, filtered article queries
+"""
+
+import base64
+import json
+from array import array
+from bisect import bisect_right
+
+from article import Article, parse_timestamp
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Articles without any timestamp sort as newest (filter_24h treats them as recent)
+UNDATED = float('-inf')
+
+# Fields that can be requested with `fields=` (the to_dict() keys)
+FIELDS = (
+    'id', 'title', 'description', 'url', 'source', 'publishedAt', 'scrapedAt',
+    'imageUrl', 'category', 'clusterId', 'saved', 'savedAt'
+)
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(sort key, id) from a cursor string; raises ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        neg_ts, article_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return (float(neg_ts), str(article_id))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class _SortedList:
+    """Articles ordered newest first, with their sort keys"""
+    
+    def __init__(self, entries):
+        entries.sort(key=lambda entry: entry[0])
+        self.keys = [key for key, _ in entries]
+        self.neg_ts = array('d', (key[0] for key in self.keys))
+        self.articles = [article for _, article in entries]
+
+
+class ArticleIndex:
+    """
+    Articles indexed for keyset pagination
+    
+    Built once per data load: one list sorted newest first (by
+    Article.timestamp, the rule TimeIndex uses; undated first, ties broken
+    by ID) plus one per source. Time ranges are binary searches over the
+    sorted keys, and a cursor is the sort key of the last article
+    returned, so each page costs O(log n + limit) however large the
+    article set is.
+    """
+    
+    def __init__(self, articles):
+        """
+        Args:
+            articles (list): Article objects (or article dictionaries)
+        """
+        entries = []
+        by_source = {}
+        for article in articles:
+            article = Article.coerce(article)
+            timestamp = article.timestamp
+            key = (-timestamp.timestamp() if timestamp else UNDATED, article.id or article.url or '')
+            entries.append((key, article))
+            by_source.setdefault(article.source, []).append((key, article))
+        
+        self.all = _SortedList(entries)
+        self.sources = {source: _SortedList(items) for source, items in by_source.items()}
+        self.by_id = {article.id: article for article in self.all.articles if article.id}
+    
+    def __len__(self):
+        return len(self.all.articles)
+    
+    def __iter__(self):
+        """Every article, newest first"""
+        return iter(self.all.articles)
+    
+    def get(self, article_id):
+        return self.by_id.get(article_id)
+    
+    def source_counts(self):
+        return {source: len(items.articles) for source, items in self.sources.items()}
+    
+    def query(self, source=None, since=None, until=None, cursor=None, limit=DEFAULT_LIMIT, fields=None):
+        """
+        One page of articles, newest first
+        
+        Args:
+            source (str): Only this source
+            since (datetime or str): Inclusive start (excludes undated articles)
+            until (datetime or str): Exclusive end (excludes undated articles)
+            cursor (str): nextCursor from the previous page
+            limit (int): Page size (capped at MAX_LIMIT)
+            fields (list): Only these keys of each article (default: all)
+        
+        Returns:
+            dict: {"articles": [...], "nextCursor": str or None, "total": matches in range}
+        
+        Raises:
+            ValueError: Bad timestamp, cursor, limit or field name
+        """
+        if fields:
+            unknown = [name for name in fields if name not in FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        limit = int(limit)
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        limit = min(limit, MAX_LIMIT)
+        
+        items = self.all if source is None else self.sources.get(source)
+        if items is None:
+            return {"articles": [], "nextCursor": None, "total": 0}
+        
+        # Keys are -timestamp ascending, so the newest article comes first
+        lo, hi = 0, len(items.keys)
+        if until is not None:
+            end = parse_timestamp(until)
+            if end is None:
+                raise ValueError(f"Invalid timestamp: {until!r}")
+            lo = bisect_right(items.neg_ts, -end.timestamp())
+        elif since is not None:
+            # Undated articles have no place in a time range
+            lo = bisect_right(items.neg_ts, UNDATED)
+        if since is not None:
+            start = parse_timestamp(since)
+            if start is None:
+                raise ValueError(f"Invalid timestamp: {since!r}")
+            hi = bisect_right(items.neg_ts, -start.timestamp())
+        total = max(hi - lo, 0)
+        
+        begin = lo
+        if cursor:
+            begin = max(lo, bisect_right(items.keys, decode_cursor(cursor)))
+        end_position = min(begin + limit, hi)
+        
+        page = items.articles[begin:end_position] if begin < end_position else []
+        next_cursor = encode_cursor(list(items.keys[end_position - 1])) if end_position < hi and page else None
+        
+        rows = [article.to_dict() for article in page]
+        if fields:
+            rows = [{name: row[name] for name in fields} for row in rows]
+        return {"articles": rows, "nextCursor": next_cursor, "total": total}
+
+
+if __name__ == "__main__":
+    from datetime import datetime, timedelta, timezone
+    
+    now = datetime.now(timezone.utc)
+    index = ArticleIndex([
+        Article(f"https://example.com/{i}", f"Article {i}", source="bens_bites" if i % 2 else "ai_rundown",
+                id=str(i), published_at=now - timedelta(hours=i))
+        for i in range(10)
+    ])
+    cursor = None
+    while True:
+        page = index.query(limit=4, cursor=cursor, fields=['title', 'source'])
+        print(page["articles"])
+        cursor = page["nextCursor"]
+        if not cursor:
+            break
+    print(index.query(source="ai_rundown", since=now - timedelta(hours=5), fields=['title']))
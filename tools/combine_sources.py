@@ -1,63 +1,118 @@
 #!/usr/bin/env python3
 """
 Combine Sources
-Merges articles from multiple scrapers, deduplicates, and generates UUIDs
+Merges articles from multiple scrapers, deduplicates by canonical URL,
+clusters near-duplicate stories, and assigns deterministic UUIDs
 """
 
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
+from article import Article, parse_timestamp
+from near_dup import cluster_articles
+from url_canon import canonicalize_url, url_key
 
-def combine_sources(scraper_outputs):
+
+def article_id(canonical_url):
+    """Deterministic article ID: UUIDv5 of the canonical URL"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, canonical_url))
+
+
+def _newest_first(article):
+    """Sort key (reverse=True): undated articles first, as ArticleIndex orders them"""
+    timestamp = article.timestamp
+    return (timestamp is None, timestamp or datetime.min.replace(tzinfo=timezone.utc))
+
+
+def combine_sources(scraper_outputs, near_dups=None):
     """
     Combine multiple scraper outputs into a single unified list
     
     Args:
         scraper_outputs (list): List of scraper output dictionaries
+        near_dups (SimHashStore): Fingerprints from earlier runs, so stories
+            cluster with articles no longer on the pages (updated in place)
         
     Returns:
-        list: Combined and deduplicated articles with UUIDs
+        list: Combined and deduplicated Article objects with UUIDs (UUIDv5
+            of the canonical URL, so the same article keeps its ID); articles
+            covering the same story share a cluster_id
     """
     all_articles = []
-    seen_urls = set()
+    seen_keys = set()  # url_key() of each canonical URL already added
     
     for output in scraper_outputs:
         source = output.get('source', 'unknown')
-        scraped_at = output.get('scrapedAt', datetime.utcnow().isoformat() + 'Z')
+        # Parsed once per source, shared by all of its articles
+        scraped_at = parse_timestamp(output.get('scrapedAt')) or parse_timestamp(datetime.utcnow())
         
         for article in output.get('articles', []):
-            url = article.get('url')
+            url = canonicalize_url(article.get('url'))
             
-            # Skip duplicates
-            if not url or url in seen_urls:
+            # Skip duplicates (tracking params, www/http variants, ...)
+            if not url:
+                continue
+            key = url_key(url, canonical=True)
+            if key in seen_keys:
                 continue
             
-            seen_urls.add(url)
+            seen_keys.add(key)
             
-            # Add UUID and metadata
-            unified_article = {
-                "id": str(uuid.uuid4()),
-                "title": article.get('title', 'Untitled'),
-                "description": article.get('description'),
-                "url": url,
-                "source": source,
-                "publishedAt": article.get('publishedAt'),
-                "scrapedAt": scraped_at,
-                "imageUrl": article.get('imageUrl'),
-                "category": article.get('category'),
-                "saved": False,
-                "savedAt": None
-            }
+            # Add stable UUID and metadata
+            unified_article = Article(
+                id=article_id(url),
+                title=article.get('title', 'Untitled'),
+                description=article.get('description'),
+                url=url,
+                source=source,
+                published_at=article.get('publishedAt'),
+                scraped_at=scraped_at,
+                image_url=article.get('imageUrl'),
+                category=article.get('category')
+            )
             
             all_articles.append(unified_article)
     
     # Sort by publishedAt (newest first), fallback to scrapedAt
-    all_articles.sort(key=lambda x: x.get('publishedAt') or x.get('scrapedAt'), reverse=True)
+    all_articles.sort(key=_newest_first, reverse=True)
+    
+    # Same story under different URLs/titles across sources
+    cluster_articles(all_articles, store=near_dups)
     
     return all_articles
 
 
+def refresh_combined(previous_articles, scraper_outputs):
+    """
+    Fast path for when no source changed since the last run
+    
+    Reuses the previously combined list (skipping dedup and ID generation)
+    and only refreshes each article's scrapedAt from its source's output,
+    so the result matches what combine_sources() would produce.
+    
+    Args:
+        previous_articles (list): Output of the last combine_sources() call
+            (Article objects or their to_dict() form)
+        scraper_outputs (list): Current scraper outputs (all unchanged)
+        
+    Returns:
+        list: Combined Article objects
+    """
+    scraped_at = {
+        output.get('source', 'unknown'): parse_timestamp(output.get('scrapedAt')) or parse_timestamp(datetime.utcnow())
+        for output in scraper_outputs
+    }
+    
+    articles = [Article.coerce(article) for article in previous_articles]
+    for article in articles:
+        article.scraped_at = scraped_at.get(article.source, article.scraped_at)
+    
+    articles.sort(key=_newest_first, reverse=True)
+    
+    return articles
+
+
 if __name__ == "__main__":
     # Test with sample data
     test_outputs = [
@@ -74,11 +129,11 @@ if __name__ == "__main__":
             "scrapedAt": "2026-02-08T20:00:00Z",
             "articles": [
                 {"title": "Article 3", "url": "https://example.com/3", "description": "Test 3"},
-                {"title": "Duplicate", "url": "https://example.com/1", "description": "Dup"}
+                {"title": "Duplicate", "url": "http://www.example.com/1/?utm_source=x", "description": "Dup"}
             ]
         }
     ]
     
     result = combine_sources(test_outputs)
     print(f"Combined into {len(result)} unique articles")
-    print(json.dumps(result, indent=2))
+    print(json.dumps([article.to_dict() for article in result], indent=2))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Article Enrichment
+Fetches each article page once to fill in publish date, description and image
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+import html_extract
+import rate_limiter
+from article import format_timestamp, parse_timestamp
+from http_session import get_session
+
+
+CACHE_PATH = os.path.join('.tmp', 'article_cache.json')
+MAX_WORKERS = int(os.getenv("ENRICH_MAX_WORKERS", "4"))
+
+HEADERS = {
+    'User-Agent': 'AI-Newsletter-Dashboard/1.0 (Educational Project)'
+}
+
+# <meta> keys checked in order of preference
+PUBLISHED_KEYS = ('article:published_time', 'og:published_time', 'datePublished', 'date')
+DESCRIPTION_KEYS = ('og:description', 'description', 'twitter:description')
+IMAGE_KEYS = ('og:image', 'twitter:image')
+
+
+class ArticleCache:
+    """Persistent URL -> extracted details map, safe to share between threads"""
+    
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def get(self, url):
+        with self.lock:
+            return self.entries.get(url)
+    
+    def put(self, url, details):
+        with self.lock:
+            self.entries[url] = details
+            self.dirty = True
+    
+    def save(self):
+        """Write the cache to disk if anything was added"""
+        with self.lock:
+            if not self.dirty:
+                return
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+
+def normalize_timestamp(value):
+    """
+    Convert an ISO 8601 timestamp to the pipeline's UTC 'Z' format
+    
+    Returns:
+        str or None: e.g. '2026-02-08T12:00:00Z', or None if unparseable
+    """
+    return format_timestamp(parse_timestamp(value))
+
+
+def extract_details(html, backend=None):
+    """
+    Pull publish date, description and image from an article page
+    
+    Args:
+        html (str): Article page HTML
+        backend: html_extract backend
+        
+    Returns:
+        dict: publishedAt, description, imageUrl (any may be None)
+    """
+    backend = backend or html_extract.get_backend()
+    doc = backend.parse(html)
+    
+    meta = {}
+    first_time = None
+    for element in backend.iter_elements(doc, ('meta', 'time')):
+        if backend.tag(element) == 'time':
+            if first_time is None and backend.attr(element, 'datetime'):
+                first_time = backend.attr(element, 'datetime')
+            continue
+        key = (backend.attr(element, 'property') or backend.attr(element, 'name')
+               or backend.attr(element, 'itemprop'))
+        content = backend.attr(element, 'content')
+        if key and content and key not in meta:
+            meta[key] = content.strip()
+    
+    def pick(keys):
+        for key in keys:
+            if meta.get(key):
+                return meta[key]
+        return None
+    
+    return {
+        "publishedAt": normalize_timestamp(pick(PUBLISHED_KEYS) or first_time),
+        "description": pick(DESCRIPTION_KEYS),
+        "imageUrl": pick(IMAGE_KEYS)
+    }
+
+
+def fetch_details(url):
+    """Fetch one article page (rate limited per host) and extract its details"""
+    rate_limiter.acquire(url)
+    response = get_session().get(url, headers=HEADERS, timeout=10)
+    response.raise_for_status()
+    details = extract_details(response.text)
+    details["fetchedAt"] = datetime.utcnow().isoformat() + "Z"
+    return details
+
+
+def enrich_articles(articles, max_workers=MAX_WORKERS, cache=None):
+    """
+    Fill missing publishedAt / description / imageUrl in place
+    
+    Each URL is fetched at most once over the cache's lifetime; later runs
+    only fetch articles that have never been seen. Existing values are
+    never overwritten.
+    
+    Args:
+        articles (list): Article dictionaries (scraper or combined format)
+        max_workers (int): Maximum concurrent page fetches
+        cache (ArticleCache): Cache to use (defaults to .tmp/article_cache.json)
+        
+    Returns:
+        dict: Stats with cached, fetched and failed counts plus errors
+    """
+    cache = cache or ArticleCache()
+    stats = {"cached": 0, "fetched": 0, "failed": 0, "errors": []}
+    
+    pending = []
+    for url in dict.fromkeys(article.get('url') for article in articles):
+        if not url:
+            continue
+        if cache.get(url) is not None:
+            stats["cached"] += 1
+        else:
+            pending.append(url)
+    
+    def worker(url):
+        try:
+            cache.put(url, fetch_details(url))
+            return None
+        except requests.exceptions.RequestException as e:
+            return f"{url}: Network error: {str(e)}"
+        except Exception as e:
+            return f"{url}: Unexpected error: {str(e)}"
+    
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+            for error in executor.map(worker, pending):
+                if error:
+                    stats["failed"] += 1
+                    stats["errors"].append(error)
+                else:
+                    stats["fetched"] += 1
+        cache.save()
+    
+    for article in articles:
+        details = cache.get(article.get('url'))
+        if not details:
+            continue
+        for field in ("publishedAt", "description", "imageUrl"):
+            if not article.get(field) and details.get(field):
+                article[field] = details[field]
+    
+    return stats
+
+
+if __name__ == "__main__":
+    # Test extraction with a sample page
+    sample = '''
+    <html><head>
+      <meta property="article:published_time" content="2026-02-08T12:30:00.000+01:00">
+      <meta property="og:description" content="A short summary">
+      <meta property="og:image" content="https://example.com/cover.png">
+    </head><body><time datetime="2026-01-01">Jan 1</time></body></html>
+    '''
+    print(json.dumps(extract_details(sample), indent=2))
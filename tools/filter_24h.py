@@ -2,53 +2,54 @@
 """
 24-Hour Filter
 Filters articles to only those published in the last 24 hours
+(or any other window, see time_index.TimeIndex)
+
+Build a TimeIndex once per article set and pass it in; plain lists are
+still accepted, but are indexed again on every call.
 """
 
 from datetime import datetime, timedelta
 import json
 
+from time_index import TimeIndex
+
+
+def _index(articles):
+    return articles if isinstance(articles, TimeIndex) else TimeIndex(articles)
+
 
-def filter_24h(articles):
+def filter_24h(articles, hours=24, now=None):
     """
     Filter articles to only those within the last 24 hours
     
+    Articles with no usable timestamp are kept (assume recent, benefit
+    of doubt).
+    
     Args:
-        articles (list): List of article dictionaries
+        articles (TimeIndex or list): Indexed articles (or a plain list of
+            Article objects / article dictionaries)
+        hours (float): Window length, for windows other than 24 hours
+        now (datetime): End of the window (defaults to the current time)
         
     Returns:
-        list: Filtered articles
+        list: Filtered articles, as passed in and in the same order
     """
-    now = datetime.utcnow()
-    cutoff = now - timedelta(hours=24)
-    
-    filtered = []
+    return _index(articles).last(hours, now=now)
+
+
+def filter_window(articles, since=None, until=None):
+    """
+    Filter articles to since <= timestamp < until
     
-    for article in articles:
-        published_at = article.get('publishedAt')
-        scraped_at = article.get('scrapedAt')
-        
-        # Use publishedAt if available, otherwise scrapedAt as fallback
-        timestamp_str = published_at or scraped_at
-        
-        if not timestamp_str:
-            # If no timestamp, include it (assume recent)
-            filtered.append(article)
-            continue
+    Args:
+        articles (TimeIndex or list): Indexed articles (or a plain list)
+        since (datetime or str): Inclusive start (None = unbounded)
+        until (datetime or str): Exclusive end (None = unbounded)
         
-        try:
-            # Parse ISO 8601 timestamp
-            # Remove 'Z' suffix and parse
-            timestamp_str = timestamp_str.replace('Z', '+00:00')
-            timestamp = datetime.fromisoformat(timestamp_str.replace('+00:00', ''))
-            
-            # Check if within 24 hours
-            if timestamp >= cutoff:
-                filtered.append(article)
-        except ValueError:
-            # If parsing fails, include the article (benefit of doubt)
-            filtered.append(article)
-    
-    return filtered
+    Returns:
+        list: Filtered articles, including those with no usable timestamp
+    """
+    return _index(articles).between(since, until)
 
 
 if __name__ == "__main__":
@@ -71,6 +72,8 @@ if __name__ == "__main__":
         }
     ]
     
-    result = filter_24h(test_articles)
+    index = TimeIndex(test_articles)
+    result = filter_24h(index)
     print(f"Filtered {len(result)} articles from {len(test_articles)}")
+    print(f"{len(filter_24h(index, hours=72))} within 72 hours (same index)")
     print(json.dumps(result, indent=2))
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+HTML Extraction
+Pluggable parser backends used by the scrapers' parse_articles()
+
+The lxml backend works on lxml's C tree directly (no BeautifulSoup
+objects), which is much faster and lighter on large archive pages.
+BeautifulSoup with 'html.parser' stays as the fallback when lxml is not
+installed, or when forced with SCRAPER_HTML_BACKEND=soup.
+"""
+
+import os
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml is optional
+    lxml_html = None
+
+
+# Text inside these tags is not visible content (matches BeautifulSoup's get_text)
+SKIP_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+
+
+class SoupBackend:
+    """BeautifulSoup tree built by the pure-Python html.parser"""
+    
+    name = 'soup'
+    
+    def parse(self, html):
+        return BeautifulSoup(html, 'html.parser')
+    
+    def links(self, doc, fragment):
+        """All <a> elements whose href contains fragment, in document order"""
+        return doc.find_all('a', href=lambda x: x and fragment in x)
+    
+    def attr(self, node, name, default=None):
+        return node.get(name, default)
+    
+    def tag(self, node):
+        return node.name
+    
+    def text(self, node):
+        return node.get_text(strip=True)
+    
+    def find_parent(self, node, names):
+        return node.find_parent(list(names))
+    
+    def next_sibling(self, node):
+        return node.find_next_sibling()
+    
+    def find(self, node, name):
+        return node.find(name)
+    
+    def iter_elements(self, doc, names):
+        """Elements with any of these tag names, in document order"""
+        return doc.find_all(list(names))
+    
+    def parent(self, node):
+        return node.parent
+
+
+class LxmlBackend:
+    """lxml.html tree (libxml2)"""
+    
+    name = 'lxml'
+    
+    def parse(self, html):
+        if not html or not html.strip():
+            html = '<html></html>'
+        return lxml_html.document_fromstring(html)
+    
+    def links(self, doc, fragment):
+        return doc.xpath('//a[contains(@href, $fragment)]', fragment=fragment)
+    
+    def attr(self, node, name, default=None):
+        return node.get(name, default)
+    
+    def tag(self, node):
+        return node.tag
+    
+    def text(self, node):
+        parts = []
+        for chunk in _iter_text(node):
+            if chunk:
+                chunk = chunk.strip()
+                if chunk:
+                    parts.append(chunk)
+        return ''.join(parts)
+    
+    def find_parent(self, node, names):
+        parent = node.getparent()
+        while parent is not None:
+            if parent.tag in names:
+                return parent
+            parent = parent.getparent()
+        return None
+    
+    def next_sibling(self, node):
+        sibling = node.getnext()
+        # Skip comments and processing instructions (non-string tags)
+        while sibling is not None and not isinstance(sibling.tag, str):
+            sibling = sibling.getnext()
+        return sibling
+    
+    def find(self, node, name):
+        return next(node.iterdescendants(name), None)
+    
+    def iter_elements(self, doc, names):
+        return doc.iter(*names)
+    
+    def parent(self, node):
+        return node.getparent()
+
+
+def _iter_text(node):
+    """Text and tails in document order, skipping comments and script/style"""
+    if not isinstance(node.tag, str) or node.tag in SKIP_TEXT_TAGS:
+        return
+    yield node.text
+    for child in node:
+        yield from _iter_text(child)
+        yield child.tail
+
+
+class ContainerIndex:
+    """
+    First descendant of each tag type per container, built in one pass
+    
+    Replaces per-link find_parent() + container.find() calls, which
+    re-walk the same containers for every link on the page. Elements are
+    visited once in document order; each target element is pushed up its
+    ancestor containers until one already has that tag recorded (every
+    container above it then has an earlier one), so total work is linear
+    in page size and lookups match container.find(tag) exactly.
+    """
+    
+    def __init__(self, backend, doc, containers=('div', 'article'), targets=('p', 'time', 'img')):
+        self.backend = backend
+        self.containers = frozenset(containers)
+        self.targets = frozenset(targets)
+        # id(container) -> (container, {tag: first descendant}); holding the
+        # container keeps its id stable (lxml proxies are created on demand)
+        self.index = {}
+        
+        for element in backend.iter_elements(doc, self.targets):
+            self._record(element, backend.tag(element))
+    
+    def _record(self, element, tag):
+        backend = self.backend
+        ancestor = backend.parent(element)
+        while ancestor is not None:
+            if backend.tag(ancestor) in self.containers:
+                entry = self.index.get(id(ancestor))
+                if entry is None:
+                    entry = (ancestor, {})
+                    self.index[id(ancestor)] = entry
+                if tag in entry[1]:
+                    break
+                entry[1][tag] = element
+            ancestor = backend.parent(ancestor)
+    
+    def container_of(self, node):
+        """Nearest enclosing container (like find_parent(containers))"""
+        return self.backend.find_parent(node, self.containers)
+    
+    def first(self, container, tag):
+        """First descendant of container with this tag (like container.find(tag))"""
+        if container is None:
+            return None
+        entry = self.index.get(id(container))
+        return entry[1].get(tag) if entry else None
+
+
+BACKENDS = {
+    'soup': SoupBackend,
+    'lxml': LxmlBackend
+}
+
+
+def get_backend(name=None):
+    """
+    Pick a parser backend
+    
+    Args:
+        name (str): 'lxml' or 'soup'; defaults to SCRAPER_HTML_BACKEND,
+            then lxml if installed, then soup
+            
+    Returns:
+        Backend instance
+    """
+    name = name or os.getenv('SCRAPER_HTML_BACKEND')
+    if not name:
+        name = 'lxml' if lxml_html is not None else 'soup'
+    if name == 'lxml' and lxml_html is None:
+        name = 'soup'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML backend: {name}")
+    return BACKENDS[name]()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache
+On-disk conditional-request cache for source pages (ETag / Last-Modified)
+"""
+
+import hashlib
+import json
+import os
+
+from http_session import get_session
+
+
+CACHE_DIR = os.path.join('.tmp', 'http_cache')
+
+
+class CachedPage:
+    """Result of a cached fetch"""
+    
+    def __init__(self, url, text, not_modified, entry):
+        self.url = url
+        self.text = text
+        self.not_modified = not_modified
+        self.entry = entry
+    
+    def cached_articles(self, version):
+        """
+        Previously parsed articles for this exact page body
+        
+        Args:
+            version (int): Parser version of the calling scraper
+            
+        Returns:
+            list or None: Articles if the page is unchanged and was parsed
+                by the same parser version, otherwise None
+        """
+        if not self.not_modified:
+            return None
+        if self.entry.get('parserVersion') != version:
+            return None
+        return self.entry.get('articles')
+
+
+def _paths(url, cache_dir):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    base = os.path.join(cache_dir, key)
+    return base + '.json', base + '.html'
+
+
+def _load_entry(url, cache_dir):
+    meta_path, body_path = _paths(url, cache_dir)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        with open(body_path, 'r', encoding='utf-8') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    return entry, body
+
+
+def _save_entry(url, entry, body, cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path, body_path = _paths(url, cache_dir)
+    if body is not None:
+        with open(body_path, 'w', encoding='utf-8') as f:
+            f.write(body)
+    # Write-then-rename so a crashed run never leaves a half-written entry
+    tmp_path = meta_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, meta_path)
+
+
+def fetch(url, headers=None, timeout=10, cache_dir=CACHE_DIR):
+    """
+    Fetch a page, revalidating against the on-disk copy
+    
+    Sends If-None-Match / If-Modified-Since when a cached copy exists.
+    A 304, or a 200 whose body hashes to the cached one (servers that
+    ignore validators), is reported as not modified.
+    
+    Args:
+        url (str): Page URL
+        headers (dict): Extra request headers (e.g. User-Agent)
+        timeout (int): Request timeout in seconds
+        cache_dir (str): Cache directory
+        
+    Returns:
+        CachedPage: Page body plus whether it changed since the last fetch
+        
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors
+    """
+    entry, cached_body = _load_entry(url, cache_dir)
+    request_headers = dict(headers or {})
+    
+    if entry:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('lastModified'):
+            request_headers['If-Modified-Since'] = entry['lastModified']
+    
+    response = get_session().get(url, headers=request_headers, timeout=timeout)
+    
+    if response.status_code == 304 and entry:
+        return CachedPage(url, cached_body, True, entry)
+    
+    response.raise_for_status()
+    body = response.text
+    content_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
+    
+    not_modified = bool(entry) and entry.get('contentHash') == content_hash
+    if not_modified:
+        # Same bytes; keep parsed articles, refresh validators only
+        new_entry = dict(entry)
+    else:
+        new_entry = {"url": url, "contentHash": content_hash}
+    new_entry['etag'] = response.headers.get('ETag')
+    new_entry['lastModified'] = response.headers.get('Last-Modified')
+    
+    _save_entry(url, new_entry, None if not_modified else body, cache_dir)
+    return CachedPage(url, body, not_modified, new_entry)
+
+
+def store_articles(page, articles, version, cache_dir=CACHE_DIR):
+    """
+    Remember the articles parsed from a page so an unchanged page
+    can skip parsing next time
+    
+    Args:
+        page (CachedPage): Page returned by fetch()
+        articles (list): Parsed articles
+        version (int): Parser version of the calling scraper
+        cache_dir (str): Cache directory
+    """
+    entry = dict(page.entry)
+    entry['articles'] = articles
+    entry['parserVersion'] = version
+    _save_entry(page.url, entry, None, cache_dir)
+    page.entry = entry
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+HTTP Session
+Process-wide pooled requests.Session shared by scrapers and SupabaseClient
+"""
+
+import os
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Connection pool defaults (per host), overridable from the environment
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+
+_session = None
+_host_pools = {}
+_lock = threading.Lock()
+
+
+def _make_adapter(pool_maxsize):
+    """Build an adapter with keep-alive pooling and retries for idempotent requests"""
+    retry = Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        respect_retry_after_header=True,
+        # Hand the last response back so callers can inspect status codes
+        raise_on_status=False
+    )
+    return HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry
+    )
+
+
+def _mount_host(session, host, pool_maxsize):
+    adapter = _make_adapter(pool_maxsize)
+    session.mount(f"https://{host}/", adapter)
+    session.mount(f"http://{host}/", adapter)
+
+
+def get_session():
+    """
+    Get the shared session, creating it on first use
+    
+    Returns:
+        requests.Session: Session whose connections are reused across calls
+    """
+    global _session
+    
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                default_adapter = _make_adapter(POOL_MAXSIZE)
+                session.mount("https://", default_adapter)
+                session.mount("http://", default_adapter)
+                for host, pool_maxsize in _host_pools.items():
+                    _mount_host(session, host, pool_maxsize)
+                _session = session
+    
+    return _session
+
+
+def configure_pool(host_or_url, pool_maxsize):
+    """
+    Set the connection pool size for one host
+    
+    Use this for hosts hit by many threads at once (e.g. parallel uploads),
+    so requests don't wait for or discard pooled connections.
+    
+    Args:
+        host_or_url (str): Hostname (with port if non-default) or any URL on that host
+        pool_maxsize (int): Maximum kept-alive connections to the host
+    """
+    host = urlparse(host_or_url).netloc if "://" in host_or_url else host_or_url
+    host = host.lower()
+    
+    with _lock:
+        if _host_pools.get(host) == pool_maxsize:
+            return
+        _host_pools[host] = pool_maxsize
+        if _session is not None:
+            _mount_host(_session, host, pool_maxsize)
+
+
+def close_session():
+    """Close pooled connections (the next get_session() starts fresh)"""
+    global _session
+    
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+NDJSON
+Streaming newline-delimited JSON I/O for article files
+"""
+
+import json
+import os
+
+
+def write_ndjson(path, articles):
+    """
+    Write articles one JSON object per line, without holding the output in memory
+    
+    Args:
+        path (str): Output file (written atomically via a temp file)
+        articles (iterable): Article dictionaries (any iterable, e.g. a generator)
+        
+    Returns:
+        int: Number of articles written
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for article in articles:
+            f.write(json.dumps(article, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def iter_ndjson(path):
+    """
+    Read articles one line at a time
+    
+    Args:
+        path (str): NDJSON file
+        
+    Yields:
+        dict: One article per non-blank line
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def write_json_array(path, articles):
+    """
+    Stream articles into the legacy pretty-printed JSON array
+    
+    Output is byte-for-byte what json.dump(list(articles), f, indent=2,
+    ensure_ascii=False) writes, but items are serialized one at a time.
+    
+    Args:
+        path (str): Output file (written atomically via a temp file)
+        articles (iterable): Article dictionaries
+        
+    Returns:
+        int: Number of articles written
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for article in articles:
+            f.write('[\n  ' if count == 0 else ',\n  ')
+            f.write(json.dumps(article, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else '[]')
+    os.replace(tmp_path, path)
+    return count
+
+
+def iter_articles_file(path):
+    """
+    Iterate articles from either format (.ndjson streams; .json is loaded whole)
+    
+    Yields:
+        dict: Articles in file order
+    """
+    if path.endswith('.ndjson'):
+        yield from iter_ndjson(path)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+
+
+def iter_batches(items, size):
+    """
+    Group an iterable into lists of up to size items
+    
+    Yields:
+        list: Consecutive batches
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Clustering
+Groups stories covered by several sources using SimHash + LSH buckets
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+from article import Article
+from url_canon import url_key
+
+
+HASH_BITS = 64
+MAX_DISTANCE = 3   # Max differing bits for two fingerprints to match
+MIN_TOKENS = 3     # Too little text gives meaningless fingerprints
+TITLE_WEIGHT = 2   # Title words count more than description words
+
+STOPWORDS = frozenset('''
+a an and are as at be by for from has have in is it its new of on or
+that the this to was were will with you your how why what
+'''.split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Fingerprints and LSH bands of every clustered article, across runs
+STORE_PATH = os.path.join('.tmp', 'near_dup.sqlite3')
+
+# SQLite integers are signed 64-bit
+SIGN_BIT = 1 << (HASH_BITS - 1)
+FINGERPRINT_MASK = (1 << HASH_BITS) - 1
+
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall((text or '').lower()) if t not in STOPWORDS]
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+# SimHash needs a per-bit weighted vote. Instead of looping over 64 bits
+# per feature, each hash bit is spread into its own 32-bit lane of a big
+# integer, so one multiply-add votes on all 64 bits at once.
+LANE_BITS = 32
+LANE_MASK = (1 << LANE_BITS) - 1
+_BYTE_LANES = [
+    sum(1 << (LANE_BITS * bit) for bit in range(8) if (byte >> bit) & 1)
+    for byte in range(256)
+]
+
+
+def _spread(h):
+    lanes = 0
+    for k in range(HASH_BITS // 8):
+        lanes |= _BYTE_LANES[(h >> (8 * k)) & 0xFF] << (LANE_BITS * 8 * k)
+    return lanes
+
+
+def simhash(article):
+    """
+    64-bit SimHash of an article's title and description
+    
+    Features are word unigrams and bigrams; title features are weighted
+    higher. Returns None when there is too little text to compare.
+    """
+    weights = {}
+    for text, weight in ((article.title, TITLE_WEIGHT), (article.description, 1)):
+        tokens = tokenize(text)
+        for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+            weights[feature] = weights.get(feature, 0) + weight
+    
+    if sum(1 for f in weights if ' ' not in f) < MIN_TOKENS:
+        return None
+    
+    # votes lane i = total weight of features whose hash has bit i set;
+    # the bit is set in the fingerprint when that is over half the total
+    votes = 0
+    total = 0
+    for feature, weight in weights.items():
+        votes += weight * _spread(_feature_hash(feature))
+        total += weight
+    
+    fingerprint = 0
+    for bit in range(HASH_BITS):
+        if 2 * ((votes >> (LANE_BITS * bit)) & LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def lsh_bands(max_distance):
+    """
+    (shift, mask) of each LSH band
+    
+    The 64 bits are split into max_distance + 1 bands. Two fingerprints
+    within max_distance bits must agree on at least one whole band
+    (pigeonhole), so a lookup only compares items sharing a band.
+    """
+    bands = max_distance + 1
+    width = HASH_BITS // bands
+    # The last band takes any leftover bits
+    return [
+        (i * width, (1 << (width if i < bands - 1 else HASH_BITS - width * (bands - 1))) - 1)
+        for i in range(bands)
+    ]
+
+
+def _distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """
+    In-memory LSH index over SimHash fingerprints (see lsh_bands)
+    """
+    
+    def __init__(self, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.bands = lsh_bands(max_distance)
+        self.buckets = [{} for _ in self.bands]
+        self.fingerprints = {}
+    
+    def add(self, key, fingerprint):
+        self.fingerprints[key] = fingerprint
+        for (shift, mask), bucket in zip(self.bands, self.buckets):
+            bucket.setdefault((fingerprint >> shift) & mask, []).append(key)
+    
+    def query(self, fingerprint):
+        """Keys whose fingerprint is within max_distance bits"""
+        matches = set()
+        for (shift, mask), bucket in zip(self.bands, self.buckets):
+            for key in bucket.get((fingerprint >> shift) & mask, ()):
+                if key not in matches and _distance(self.fingerprints[key], fingerprint) <= self.max_distance:
+                    matches.add(key)
+        return matches
+    
+    def __len__(self):
+        return len(self.fingerprints)
+
+
+class SimHashStore:
+    """
+    Persistent LSH index: every article fingerprinted so far, in SQLite
+    
+    Keyed by url_key, with each article's fingerprint, band values and
+    cluster_id. A lookup is one indexed query per band, so its cost tracks
+    the matching bucket, not the number of articles stored, and new
+    articles can join clusters from earlier runs.
+    """
+    
+    def __init__(self, path=STORE_PATH, max_distance=MAX_DISTANCE):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.max_distance = max_distance
+        self.bands = lsh_bands(max_distance)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                key TEXT PRIMARY KEY,
+                fingerprint INTEGER NOT NULL,
+                cluster_id TEXT,
+                seen_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (band, value, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS fingerprints_cluster ON fingerprints (cluster_id);
+            """
+        )
+        self.conn.commit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.conn.close()
+    
+    def query(self, fingerprint):
+        """
+        Stored articles within max_distance bits
+        
+        Returns:
+            dict: key -> cluster_id (None for articles not in a cluster)
+        """
+        matches = {}
+        for band, (shift, mask) in enumerate(self.bands):
+            rows = self.conn.execute(
+                """
+                SELECT f.key, f.fingerprint, f.cluster_id FROM bands b
+                JOIN fingerprints f ON f.key = b.key
+                WHERE b.band = ? AND b.value = ?
+                """,
+                (band, (fingerprint >> shift) & mask)
+            )
+            for key, stored, cluster_id in rows:
+                if key not in matches and _distance(stored & FINGERPRINT_MASK, fingerprint) <= self.max_distance:
+                    matches[key] = cluster_id
+        return matches
+    
+    def add(self, entries, seen_at=None):
+        """
+        Store (or replace) fingerprints
+        
+        Args:
+            entries (list): (key, fingerprint, cluster_id) tuples
+            seen_at (str): ISO timestamp (defaults to now)
+        """
+        seen_at = seen_at or datetime.utcnow().isoformat() + 'Z'
+        entries = list(entries)
+        with self.conn:
+            # Old band rows of re-fingerprinted articles (text may have changed)
+            old = []
+            for key, _, _ in entries:
+                row = self.conn.execute("SELECT fingerprint FROM fingerprints WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    old.append((key, row[0]))
+            self.conn.executemany(
+                "DELETE FROM bands WHERE band = ? AND value = ? AND key = ?",
+                [(band, ((stored & FINGERPRINT_MASK) >> shift) & mask, key)
+                 for key, stored in old for band, (shift, mask) in enumerate(self.bands)]
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO fingerprints (key, fingerprint, cluster_id, seen_at) VALUES (?, ?, ?, ?)",
+                [(key, fingerprint - (1 << HASH_BITS) if fingerprint & SIGN_BIT else fingerprint, cluster_id, seen_at)
+                 for key, fingerprint, cluster_id in entries]
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO bands (band, value, key) VALUES (?, ?, ?)",
+                [(band, (fingerprint >> shift) & mask, key)
+                 for key, fingerprint, _ in entries for band, (shift, mask) in enumerate(self.bands)]
+            )
+    
+    def set_cluster(self, keys, cluster_id, merged=()):
+        """
+        Move stored articles into a cluster
+        
+        Args:
+            keys (list): Stored articles to move (matched directly)
+            cluster_id (str): Cluster they join
+            merged (list): Stored cluster IDs folded into it; all of their
+                members are relabelled, not just the ones matched directly
+        """
+        merged = [old for old in set(merged) if old and old != cluster_id]
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE fingerprints SET cluster_id = ? WHERE key = ?",
+                [(cluster_id, key) for key in keys]
+            )
+            self.conn.executemany(
+                "UPDATE fingerprints SET cluster_id = ? WHERE cluster_id = ?",
+                [(cluster_id, old) for old in merged]
+            )
+    
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+
+def cluster_articles(articles, max_distance=MAX_DISTANCE, store=None):
+    """
+    Set cluster_id on articles that cover the same story
+    
+    Articles in a group of two or more get the same cluster_id (the
+    smallest url_key in the group, so it is stable across runs);
+    everything else gets cluster_id None.
+    
+    With a store, articles are also matched against every article stored
+    by earlier runs, and then added to it. A group that takes in a stored
+    cluster keeps that cluster's ID; when it joins several, the smallest
+    ID wins and every stored member of the others is relabelled. Earlier
+    articles that are not in this batch keep the cluster_id they were
+    written out with.
+    
+    Args:
+        articles (list): Article objects
+        max_distance (int): Max SimHash bit difference to count as a match
+        store (SimHashStore): Persistent index to match against and update
+        
+    Returns:
+        int: Number of clusters with more than one article
+    """
+    index = SimHashIndex(max_distance)
+    keys = [url_key(article.url) for article in articles]
+    # Union-find over url_keys: this batch plus matching stored articles
+    parent = {key: key for key in keys}
+    stored_clusters = {}
+    
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+    
+    def union(a, b):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+    
+    fingerprints = {}
+    for i, article in enumerate(articles):
+        fingerprint = simhash(article)
+        if fingerprint is None:
+            continue
+        fingerprints[keys[i]] = fingerprint
+        for j in index.query(fingerprint):
+            union(keys[i], keys[j])
+        index.add(i, fingerprint)
+        if store is not None:
+            for key, cluster_id in store.query(fingerprint).items():
+                parent.setdefault(key, key)
+                stored_clusters[key] = cluster_id
+                union(keys[i], key)
+    
+    groups = {}
+    for key in parent:
+        groups.setdefault(find(key), set()).add(key)
+    
+    clusters = 0
+    cluster_ids = {}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        clusters += 1
+        existing = [stored_clusters[key] for key in members if stored_clusters.get(key)]
+        cluster_id = min(existing) if existing else min(members)
+        for key in members:
+            cluster_ids[key] = cluster_id
+        if store is not None:
+            store.set_cluster([key for key in members if key in stored_clusters], cluster_id, merged=existing)
+    
+    for key, article in zip(keys, articles):
+        article.cluster_id = cluster_ids.get(key)
+    
+    if store is not None:
+        store.add([(key, fingerprint, cluster_ids.get(key)) for key, fingerprint in fingerprints.items()])
+    
+    return clusters
+
+
+if __name__ == "__main__":
+    sample = [Article.from_dict(article) for article in [
+        {"url": "https://www.bensbites.com/p/openai-gpt-5", "title": "OpenAI launches GPT-5 with better reasoning and tools",
+         "description": "OpenAI released GPT-5 today with improved reasoning."},
+        {"url": "https://www.therundown.ai/p/gpt-5", "title": "OpenAI launches GPT-5 with better reasoning and tools!",
+         "description": "OpenAI released GPT-5 today with improved reasoning."},
+        {"url": "https://www.therundown.ai/p/robots", "title": "Figure shows off humanoid robots in a BMW factory",
+         "description": None},
+    ]]
+    print(f"{cluster_articles(sample)} cluster(s)")
+    for article in sample:
+        print(f"{article.cluster_id}  {article.title}")
+    
+    # A later run's article joins a story stored by an earlier run
+    with SimHashStore(':memory:') as store:
+        cluster_articles(sample[1:], store=store)
+        later = Article.from_dict({"url": "https://example.com/gpt-5", "title": "OpenAI launches GPT-5 with better reasoning and tools",
+                                   "description": "OpenAI released GPT-5 today with improved reasoning."})
+        cluster_articles([later], store=store)
+        print(f"{later.cluster_id}  {later.title} (next run, {len(store)} stored)")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+HTTP Negotiation
+Accept-Encoding and If-None-Match parsing shared by server.py and the
+Modal web endpoint
+"""
+
+
+def accepted_encodings(header):
+    """Content codings the client accepts (q > 0)"""
+    accepted = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def etag_matches(header, etag):
+    """
+    Whether an If-None-Match header matches an ETag
+    
+    Args:
+        header (str): If-None-Match value (a list of tags, possibly W/, or *)
+        etag (str): Quoted strong ETag of the current representation
+    
+    Returns:
+        bool: True if the client's copy is current (answer 304)
+    """
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or etag in tags or 'W/' + etag in tags
+
+
+if __name__ == "__main__":
+    print(accepted_encodings("gzip;q=0, br;q=0.8, identity"))
+    print(etag_matches('W/"abc", "def"', '"abc"'), etag_matches('"def"', '"abc"'))
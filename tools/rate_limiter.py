@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter
+Per-host token buckets shared by every scraper in the process
+"""
+
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+
+# Defaults match the old fixed 2s pause (0.5 requests/sec), but allow a
+# small burst so the first requests to an idle host go out immediately
+DEFAULT_RATE = float(os.getenv("SCRAPER_RATE_LIMIT", "0.5"))
+DEFAULT_BURST = float(os.getenv("SCRAPER_RATE_BURST", "2"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second"""
+    
+    def __init__(self, rate, burst):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be > 0 and burst must be >= 1")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """
+        Take one token, going into debt if the bucket is empty
+        
+        Returns:
+            float: Seconds the caller must wait before using the token
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def acquire(self):
+        """
+        Block until a token is available
+        
+        Returns:
+            float: Seconds spent waiting (0 when the host had budget left)
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Token buckets keyed by hostname"""
+    
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+    
+    def configure(self, host, rate=None, burst=None):
+        """
+        Set the rate and burst for a single host
+        
+        Args:
+            host (str): Hostname, e.g. 'www.bensbites.com'
+            rate (float): Requests per second
+            burst (float): Maximum number of back-to-back requests
+        """
+        host = host.lower()
+        with self.lock:
+            self.overrides[host] = (rate or self.rate, burst or self.burst)
+            self.buckets.pop(host, None)
+    
+    def bucket(self, host):
+        """Get (or lazily create) the bucket for a host"""
+        host = host.lower()
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, burst = self.overrides.get(host, (self.rate, self.burst))
+                bucket = TokenBucket(rate, burst)
+                self.buckets[host] = bucket
+            return bucket
+    
+    def acquire(self, url):
+        """
+        Wait for permission to send one request to the URL's host
+        
+        Args:
+            url (str): Absolute URL about to be requested
+            
+        Returns:
+            float: Seconds spent waiting
+        """
+        host = urlparse(url).hostname or ""
+        return self.bucket(host).acquire()
+
+
+# Process-wide limiter used by the scrapers
+limiter = RateLimiter()
+
+
+def acquire(url):
+    """Acquire a token for the URL's host from the shared limiter"""
+    return limiter.acquire(url)
+
+
+def configure(host, rate=None, burst=None):
+    """Override the shared limiter's settings for one host"""
+    limiter.configure(host, rate=rate, burst=burst)
+
+
+if __name__ == "__main__":
+    # Demo: 5 requests against one host at 2 req/s with a burst of 2
+    demo = RateLimiter(rate=2, burst=2)
+    start = time.monotonic()
+    for i in range(5):
+        waited = demo.acquire("https://www.example.com/p/1")
+        print(f"request {i + 1}: waited {waited:.2f}s, t={time.monotonic() - start:.2f}s")
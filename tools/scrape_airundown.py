@@ -5,11 +5,109 @@ Scrapes latest articles from The AI Rundown homepage
 """
 
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import json
 
+import html_extract
+import http_cache
+import rate_limiter
+import url_canon
+
+
+# Bump when parse_articles() output changes so cached parses are discarded
+PARSER_VERSION = 4
+
+BASE_URL = "https://www.therundown.ai"
+
+
+def parse_articles(html, backend=None):
+    """
+    Extract articles from The AI Rundown homepage HTML
+    
+    Args:
+        html (str): Page HTML
+        backend: html_extract backend (defaults to lxml when installed)
+        
+    Returns:
+        list: Article dictionaries
+    """
+    # Parse HTML
+    backend = backend or html_extract.get_backend()
+    doc = backend.parse(html)
+    index = html_extract.ContainerIndex(backend, doc)
+    
+    # Find all article links (therundown.ai uses /p/ for posts)
+    article_links = backend.links(doc, '/p/')
+    
+    articles = []
+    seen_urls = set()  # Dedup within source
+    
+    for link in article_links:
+        # Absolute, canonical URL (drops tracking params, www/http variants)
+        article_url = url_canon.canonicalize_url(backend.attr(link, 'href', ''), base=BASE_URL)
+        
+        # Skip if already seen
+        if not article_url or article_url in seen_urls:
+            continue
+        
+        # Skip non-web URLs
+        if not article_url.startswith('https://'):
+            continue
+        
+        seen_urls.add(article_url)
+        
+        # Extract title from link text or h3 parent
+        title = backend.text(link)
+        
+        # Try to find h3 parent for better title extraction
+        h3_parent = backend.find_parent(link, ('h3',))
+        if h3_parent is not None:
+            title = backend.text(h3_parent)
+        
+        # Skip if no valid title
+        if not title or len(title) < 3:
+            continue
+        
+        # Try to extract description from following paragraph
+        description = None
+        
+        # Look for description after link or in parent's next sibling
+        container = index.container_of(link)
+        if container is not None:
+            # Find next paragraph after the title
+            next_p = index.first(container, 'p')
+            if next_p is not None:
+                desc_text = backend.text(next_p)
+                # Only use if it's substantial and not the title
+                if desc_text and desc_text != title and len(desc_text) > 20:
+                    description = desc_text
+        
+        # Extract publish date if available
+        publishedAt = None
+        time_elem = index.first(container, 'time')
+        if time_elem is not None and backend.attr(time_elem, 'datetime'):
+            publishedAt = backend.attr(time_elem, 'datetime')
+        
+        # Look for image
+        imageUrl = None
+        if container is not None:
+            img = index.first(container, 'img')
+            if img is not None and backend.attr(img, 'src'):
+                imageUrl = backend.attr(img, 'src')
+        
+        article = {
+            "title": title,
+            "description": description,
+            "url": article_url,
+            "publishedAt": publishedAt,
+            "imageUrl": imageUrl,
+            "category": None
+        }
+        
+        articles.append(article)
+    
+    return articles
+
 
 def scrape():
     """
@@ -23,7 +121,8 @@ def scrape():
         "scrapedAt": datetime.utcnow().isoformat() + "Z",
         "articlesFound": 0,
         "articles": [],
-        "errors": []
+        "errors": [],
+        "unchanged": False
     }
     
     try:
@@ -33,89 +132,20 @@ def scrape():
         }
         
         # Fetch homepage
-        url = "https://www.therundown.ai"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all article links (therundown.ai uses /p/ for posts)
-        article_links = soup.find_all('a', href=lambda x: x and '/p/' in x)
-        
-        seen_urls = set()  # Dedup within source
-        
-        for link in article_links:
-            article_url = link.get('href', '')
-            
-            # Skip if already seen
-            if not article_url or article_url in seen_urls:
-                continue
-            
-            # Make absolute URL if relative
-            if article_url.startswith('/'):
-                article_url = 'https://www.therundown.ai' + article_url
-            
-            # Skip non-https URLs
-            if not article_url.startswith('https://'):
-                continue
-            
-            seen_urls.add(article_url)
-            
-            # Extract title from link text or h3 parent
-            title = link.get_text(strip=True)
-            
-            # Try to find h3 parent for better title extraction
-            h3_parent = link.find_parent('h3')
-            if h3_parent:
-                title = h3_parent.get_text(strip=True)
-            
-            # Skip if no valid title
-            if not title or len(title) < 3:
-                continue
-            
-            # Try to extract description from following paragraph
-            description = None
-            
-            # Look for description after link or in parent's next sibling
-            container = link.find_parent(['div', 'article'])
-            if container:
-                # Find next paragraph after the title
-                next_p = container.find('p')
-                if next_p:
-                    desc_text = next_p.get_text(strip=True)
-                    # Only use if it's substantial and not the title
-                    if desc_text and desc_text != title and len(desc_text) > 20:
-                        description = desc_text
-            
-            # Extract publish date if available
-            publishedAt = None
-            time_elem = container.find('time') if container else None
-            if time_elem and time_elem.get('datetime'):
-                publishedAt = time_elem['datetime']
-            
-            # Look for image
-            imageUrl = None
-            if container:
-                img = container.find('img')
-                if img and img.get('src'):
-                    imageUrl = img['src']
-            
-            article = {
-                "title": title,
-                "description": description,
-                "url": article_url,
-                "publishedAt": publishedAt,
-                "imageUrl": imageUrl,
-                "category": None
-            }
-            
-            output["articles"].append(article)
+        url = BASE_URL
+        rate_limiter.acquire(url)  # Waits only if the host is out of budget
+        page = http_cache.fetch(url, headers=headers, timeout=10)
         
-        output["articlesFound"] = len(output["articles"])
+        # Unchanged page (304 or same content hash): reuse the last parse
+        articles = page.cached_articles(PARSER_VERSION)
+        if articles is not None:
+            output["unchanged"] = True
+        else:
+            articles = parse_articles(page.text)
+            http_cache.store_articles(page, articles, PARSER_VERSION)
         
-        # Rate limiting - wait 2 seconds
-        time.sleep(2)
+        output["articles"] = articles
+        output["articlesFound"] = len(output["articles"])
         
     except requests.exceptions.RequestException as e:
         output["errors"].append(f"Network error: {str(e)}")
@@ -5,11 +5,98 @@ Scrapes latest articles from Ben's Bites archive page
 """
 
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-import time
 import json
 
+import html_extract
+import http_cache
+import rate_limiter
+import url_canon
+
+
+# Bump when parse_articles() output changes so cached parses are discarded
+PARSER_VERSION = 4
+
+BASE_URL = "https://www.bensbites.com"
+
+
+def parse_articles(html, backend=None):
+    """
+    Extract articles from the Ben's Bites archive page HTML
+    
+    Args:
+        html (str): Page HTML
+        backend: html_extract backend (defaults to lxml when installed)
+        
+    Returns:
+        list: Article dictionaries
+    """
+    # Parse HTML
+    backend = backend or html_extract.get_backend()
+    doc = backend.parse(html)
+    index = html_extract.ContainerIndex(backend, doc)
+    
+    # Find all article links
+    # Ben's Bites structure: Links to /p/ are articles
+    article_links = backend.links(doc, '/p/')
+    
+    articles = []
+    seen_urls = set()  # Dedup within source
+    
+    for link in article_links:
+        # Absolute, canonical URL (drops tracking params, www/http variants)
+        article_url = url_canon.canonicalize_url(backend.attr(link, 'href', ''), base=BASE_URL)
+        
+        # Skip if already seen or not a valid article URL
+        if not article_url or article_url in seen_urls:
+            continue
+        
+        # Skip non-web URLs
+        if not article_url.startswith('https://'):
+            continue
+        
+        seen_urls.add(article_url)
+        
+        # Extract title (link text)
+        title = backend.text(link)
+        
+        # Skip if no title
+        if not title or len(title) < 3:
+            continue
+        
+        # Try to extract description from next sibling
+        description = None
+        next_elem = backend.next_sibling(link)
+        if next_elem is not None and backend.tag(next_elem) in ['p', 'div']:
+            desc_text = backend.text(next_elem)
+            if desc_text and desc_text != title:
+                description = desc_text
+        
+        # Estimate publish date - for now use scrapeAt
+        # (Ben's Bites doesn't have explicit dates on archive page)
+        publishedAt = None
+        
+        # Look for image
+        imageUrl = None
+        parent = index.container_of(link)
+        if parent is not None:
+            img = index.first(parent, 'img')
+            if img is not None and backend.attr(img, 'src'):
+                imageUrl = backend.attr(img, 'src')
+        
+        article = {
+            "title": title,
+            "description": description,
+            "url": article_url,
+            "publishedAt": publishedAt,
+            "imageUrl": imageUrl,
+            "category": None
+        }
+        
+        articles.append(article)
+    
+    return articles
+
 
 def scrape():
     """
@@ -23,7 +110,8 @@ def scrape():
         "scrapedAt": datetime.utcnow().isoformat() + "Z",
         "articlesFound": 0,
         "articles": [],
-        "errors": []
+        "errors": [],
+        "unchanged": False
     }
     
     try:
@@ -33,79 +121,21 @@ def scrape():
         }
         
         # Fetch archive page
-        url = "https://www.bensbites.com/archive"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+        url = BASE_URL + "/archive"
+        rate_limiter.acquire(url)  # Waits only if the host is out of budget
+        page = http_cache.fetch(url, headers=headers, timeout=10)
         
-        # Find all article links
-        # Ben's Bites structure: Links to /p/ are articles
-        article_links = soup.find_all('a', href=lambda x: x and '/p/' in x)
-        
-        seen_urls = set()  # Dedup within source
-        
-        for link in article_links:
-            article_url = link.get('href', '')
-            
-            # Skip if already seen or not a valid article URL
-            if not article_url or article_url in seen_urls:
-                continue
-                
-            # Make absolute URL if relative
-            if article_url.startswith('/'):
-                article_url = 'https://www.bensbites.com' + article_url
-            
-            # Skip non-https URLs
-            if not article_url.startswith('https://'):
-                continue
-            
-            seen_urls.add(article_url)
-            
-            # Extract title (link text)
-            title = link.get_text(strip=True)
-            
-            # Skip if no title
-            if not title or len(title) < 3:
-                continue
-            
-            # Try to extract description from next sibling
-            description = None
-            next_elem = link.find_next_sibling()
-            if next_elem and next_elem.name in ['p', 'div']:
-                desc_text = next_elem.get_text(strip=True)
-                if desc_text and desc_text != title:
-                    description = desc_text
-            
-            # Estimate publish date - for now use scrapeAt
-            # (Ben's Bites doesn't have explicit dates on archive page)
-            publishedAt = None
-            
-            # Look for image
-            imageUrl = None
-            parent = link.find_parent(['div', 'article'])
-            if parent:
-                img = parent.find('img')
-                if img and img.get('src'):
-                    imageUrl = img['src']
-            
-            article = {
-                "title": title,
-                "description": description,
-                "url": article_url,
-                "publishedAt": publishedAt,
-                "imageUrl": imageUrl,
-                "category": None
-            }
-            
-            output["articles"].append(article)
+        # Unchanged page (304 or same content hash): reuse the last parse
+        articles = page.cached_articles(PARSER_VERSION)
+        if articles is not None:
+            output["unchanged"] = True
+        else:
+            articles = parse_articles(page.text)
+            http_cache.store_articles(page, articles, PARSER_VERSION)
         
+        output["articles"] = articles
         output["articlesFound"] = len(output["articles"])
         
-        # Rate limiting - wait 2 seconds if we need to make another request
-        time.sleep(2)
-        
     except requests.exceptions.RequestException as e:
         output["errors"].append(f"Network error: {str(e)}")
     except Exception as e:
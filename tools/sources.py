@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Source Registry
+Lists every newsletter scraper the pipeline runs
+"""
+
+import scrape_bensbites
+import scrape_airundown
+
+
+# Each entry: log key, display name, and the scraper's scrape() function.
+# Add new newsletters here and they are picked up by scrape_all.
+SOURCES = [
+    {
+        "key": "bens_bites",
+        "name": "Ben's Bites",
+        "scrape": scrape_bensbites.scrape
+    },
+    {
+        "key": "ai_rundown",
+        "name": "The AI Rundown",
+        "scrape": scrape_airundown.scrape
+    }
+]
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Sync Manifest
+Remembers what was last pushed to Supabase so uploads only send changes
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+
+
+MANIFEST_PATH = os.path.join('.tmp', 'sync_manifest.sqlite3')
+
+# scraped_at changes on every run without the article changing
+IGNORED_COLUMNS = ('scraped_at',)
+
+# Stay well under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+def row_hash(row):
+    """Content hash of a database row, ignoring per-run columns"""
+    content = {k: v for k, v in row.items() if k not in IGNORED_COLUMNS}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SyncManifest:
+    """
+    article_id -> content hash of the row last pushed
+    
+    Kept in SQLite and committed on every mark_synced(), so memory doesn't
+    grow with the archive and an interrupted upload keeps its progress.
+    A manifest from the old JSON format (same path, .json) is imported
+    the first time.
+    """
+    
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS synced (
+                article_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self._import_json(os.path.splitext(path)[0] + '.json')
+    
+    def _import_json(self, json_path):
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                hashes = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO synced (article_id, content_hash) VALUES (?, ?)",
+                hashes.items()
+            )
+        os.replace(json_path, json_path + '.imported')
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.conn.close()
+    
+    def _known_hashes(self, article_ids):
+        known = {}
+        for i in range(0, len(article_ids), LOOKUP_CHUNK):
+            chunk = article_ids[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            known.update(self.conn.execute(
+                f"SELECT article_id, content_hash FROM synced WHERE article_id IN ({placeholders})",
+                chunk
+            ))
+        return known
+    
+    def plan(self, rows):
+        """
+        Split rows into what needs sending
+        
+        Args:
+            rows (list): Database rows (with article_id)
+            
+        Returns:
+            tuple: (rows to send, stats dict with inserted/updated/skipped)
+        """
+        to_send = []
+        stats = {"inserted": 0, "updated": 0, "skipped": 0}
+        known_hashes = self._known_hashes([row.get("article_id") for row in rows if row.get("article_id")])
+        
+        for row in rows:
+            known = known_hashes.get(row.get("article_id"))
+            if known is None:
+                stats["inserted"] += 1
+            elif known != row_hash(row):
+                stats["updated"] += 1
+            else:
+                stats["skipped"] += 1
+                continue
+            to_send.append(row)
+        
+        return to_send, stats
+    
+    def mark_synced(self, rows):
+        """Record rows as pushed (call only after the upload succeeded)"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO synced (article_id, content_hash) VALUES (?, ?)",
+                [(row["article_id"], row_hash(row)) for row in rows]
+            )
+    
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM synced").fetchone()[0]
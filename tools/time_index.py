@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Time Index
+Sorted timestamp index for answering time-window queries over articles
+"""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+
+from article import Article, parse_timestamp
+
+
+def _epoch(value):
+    """Seconds since the epoch for a datetime or ISO string (naive = UTC)"""
+    parsed = parse_timestamp(value)
+    if parsed is None:
+        raise ValueError(f"Invalid timestamp: {value!r}")
+    return parsed.timestamp()
+
+
+class TimeIndex:
+    """
+    Articles keyed by publish time (scrape time as fallback)
+    
+    Timestamps are parsed once into a sorted array of epoch seconds, so
+    each window query is a binary search plus the matching slice instead
+    of a scan. Articles without a usable timestamp (Article.timestamp is
+    None) are treated as recent and returned by every query, as
+    filter_24h always has.
+    
+    Results keep the order the articles were given in.
+    """
+    
+    def __init__(self, articles):
+        """
+        Args:
+            articles (list): Article objects (or article dictionaries); returned as passed
+        """
+        self.articles = list(articles)
+        self.undated = []
+        keyed = []
+        for position, article in enumerate(self.articles):
+            timestamp = Article.coerce(article).timestamp
+            if timestamp is None:
+                self.undated.append(position)
+            else:
+                keyed.append((timestamp.timestamp(), position))
+        keyed.sort()
+        self.times = array('d', (key for key, _ in keyed))
+        self.positions = array('l', (position for _, position in keyed))
+    
+    def __len__(self):
+        return len(self.articles)
+    
+    def between(self, start=None, end=None, include_undated=True):
+        """
+        Articles with start <= timestamp < end
+        
+        Args:
+            start (datetime or str): Inclusive lower bound (None = unbounded)
+            end (datetime or str): Exclusive upper bound (None = unbounded)
+            include_undated (bool): Also return articles without a timestamp
+        
+        Returns:
+            list: Matching articles
+        """
+        lo = 0 if start is None else bisect_left(self.times, _epoch(start))
+        hi = len(self.times) if end is None else bisect_left(self.times, _epoch(end))
+        selected = list(self.positions[lo:hi]) if lo < hi else []
+        if include_undated:
+            selected.extend(self.undated)
+        selected.sort()
+        return [self.articles[position] for position in selected]
+    
+    def since(self, start, include_undated=True):
+        """Articles at or after start"""
+        return self.between(start, None, include_undated)
+    
+    def last(self, hours=24, now=None, include_undated=True):
+        """
+        Articles from the last `hours` hours
+        
+        Args:
+            hours (float): Window length
+            now (datetime): End of the window (defaults to the current time)
+        """
+        now = parse_timestamp(now) or datetime.now(timezone.utc)
+        return self.between(now - timedelta(hours=hours), None, include_undated)
+
+
+if __name__ == "__main__":
+    now = datetime.now(timezone.utc)
+    index = TimeIndex([
+        Article("https://example.com/1", "Recent", published_at=now - timedelta(hours=1)),
+        Article("https://example.com/2", "Yesterday", published_at=now - timedelta(hours=30)),
+        Article("https://example.com/3", "Last week", published_at=now - timedelta(days=7)),
+        Article("https://example.com/4", "Undated", published_at="Feb 8"),
+    ])
+    for label, result in (
+        ("last 24h", index.last(24)),
+        ("last 48h", index.last(48)),
+        ("2-8 days ago", index.between(now - timedelta(days=8), now - timedelta(days=2), include_undated=False)),
+    ):
+        print(f"{label}: {[article.title for article in result]}")
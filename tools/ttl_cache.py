@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+TTL Cache
+Thread-safe LRU cache whose entries expire after a fixed time-to-live
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """LRU cache with per-entry expiry and hit/miss counters"""
+    
+    def __init__(self, maxsize=128, ttl=60.0, clock=time.monotonic):
+        """
+        Args:
+            maxsize (int): Entries kept before the least recently used is evicted
+            ttl (float): Seconds an entry stays valid
+            clock: Time source (monotonic seconds)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key, default=None):
+        """Return the cached value, or default if missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self.entries[key]
+            self.misses += 1
+            return default
+    
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (self.clock() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, predicate):
+        """
+        Drop every entry whose key matches
+        
+        Args:
+            predicate: Function called with each key
+            
+        Returns:
+            int: Number of entries removed
+        """
+        with self.lock:
+            stale = [key for key in self.entries if predicate(key)]
+            for key in stale:
+                del self.entries[key]
+            return len(stale)
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def stats(self):
+        """Counters for sizing the cache"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl
+            }
+    
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+URL Canonicalization
+Normalizes article URLs so the same article always has the same URL and key
+"""
+
+import hashlib
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+
+# Query parameters that never change which article a URL points to
+TRACKING_PARAMS = frozenset([
+    'ref', 'ref_src', 'fbclid', 'gclid', 'dclid', 'msclkid',
+    'mc_cid', 'mc_eid', 'igshid', '_hsenc', '_hsmi', 'mkt_tok', 'last_resource_guid'
+])
+TRACKING_PREFIXES = ('utm_',)
+
+# url_key() compares hosts without "www." and http/https; canonical URLs
+# keep the host and scheme they were found with (so they still resolve),
+# except for these sources, which are written in the form they serve
+PREFERRED_HOSTS = {
+    'bensbites.com': 'www.bensbites.com',
+    'therundown.ai': 'www.therundown.ai'
+}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url, base=None):
+    """
+    Normalize an article URL
+    
+    Resolves relative links against base, lowercases the scheme and host
+    (known sources get their preferred https host), drops default ports,
+    tracking parameters, fragments and trailing slashes, and sorts the
+    query. "www." and http/https are only folded in url_key(), so the
+    returned URL is still one the site answers.
+    
+    Args:
+        url (str): Absolute or relative URL
+        base (str): Page URL to resolve relative links against
+        
+    Returns:
+        str: Canonical URL ('' if url is empty)
+    """
+    if not url:
+        return ''
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+    
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS:
+        # mailto:, javascript:, relative URLs without a base, ...
+        return url
+    
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    # Default for the scheme the URL came with (http://host:80 -> host)
+    if port == DEFAULT_PORTS[scheme]:
+        port = None
+    
+    host = (parts.hostname or '').rstrip('.')
+    bare = host[4:] if host.startswith('www.') else host
+    if bare in PREFERRED_HOSTS:
+        host = PREFERRED_HOSTS[bare]
+        scheme = 'https'
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    
+    path = parts.path.rstrip('/')
+    
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking(k)]
+    query.sort()
+    
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def url_key(url, canonical=False):
+    """
+    Fixed-width dedup key for a URL
+    
+    16 hex chars of BLAKE2b over the canonical URL with "www." dropped and
+    http taken as https, so those variants share a key.
+    
+    Args:
+        url (str): Any URL
+        canonical (bool): url is already canonical, skip re-normalizing it
+        
+    Returns:
+        str: Hash key
+    """
+    if not canonical:
+        url = canonicalize_url(url)
+    parts = urlsplit(url)
+    if parts.scheme in DEFAULT_PORTS:
+        host = parts.netloc[4:] if parts.netloc.startswith('www.') else parts.netloc
+        url = urlunsplit(('https', host, parts.path, parts.query, ''))
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+
+
+if __name__ == "__main__":
+    # These should all collapse to one canonical URL
+    variants = [
+        "https://www.bensbites.com/p/some-story",
+        "http://bensbites.com/p/some-story/",
+        "https://WWW.BensBites.com/p/some-story?utm_source=twitter&utm_medium=social",
+        "https://www.bensbites.com:443/p/some-story#comments",
+        "http://bensbites.com:80/p/some-story",
+    ]
+    for variant in variants:
+        print(f"{url_key(variant)}  {canonicalize_url(variant)}")
+    print(canonicalize_url("/p/relative", base="https://www.therundown.ai"))
+    # Other hosts keep www/http in the URL but share a key
+    for variant in ("http://www.example.com/story/", "https://example.com/story"):
+        print(f"{url_key(variant)}  {canonicalize_url(variant)}")
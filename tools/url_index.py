@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+URL Index
+Persistent SQLite index of every article URL seen across runs
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+
+INDEX_PATH = os.path.join('.tmp', 'url_index.sqlite3')
+
+# Fields that make an article "changed" when they differ from last time
+CONTENT_FIELDS = ('title', 'description', 'publishedAt', 'imageUrl', 'category')
+
+# Stay well under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+def content_hash(article):
+    """Stable hash of an article's scraped content"""
+    payload = json.dumps([article.get(field) for field in CONTENT_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class UrlIndex:
+    """
+    Known article URLs with their content hash and first/last seen times
+    
+    update() only stages the new or changed articles it returns (in a
+    pending table); they count as seen once mark() is called, after they
+    have been delivered. Until then every run returns them again.
+    """
+    
+    def __init__(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pending (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                first_seen TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        self.conn.close()
+    
+    def _lookup(self, sql, urls):
+        found = {}
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            chunk = urls[i:i + LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            found.update(self.conn.execute(sql.format(placeholders=placeholders), chunk))
+        return found
+    
+    def content_hashes(self, urls):
+        """
+        Content hash last marked for each URL
+        
+        Returns:
+            dict: url -> content_hash(), for the URLs recorded as seen
+        """
+        return self._lookup("SELECT url, content_hash FROM articles WHERE url IN ({placeholders})", list(urls))
+    
+    def update(self, articles, seen_at=None):
+        """
+        Find the new or changed articles in a scraped batch
+        
+        The delta is staged, not recorded: pass it to mark() once it has
+        been written out or uploaded, so a failed run can't lose it.
+        
+        Args:
+            articles (list): Article dictionaries with a 'url'
+            seen_at (str): ISO timestamp for last_seen (defaults to now)
+            
+        Returns:
+            list: Articles that are new, or whose content changed since last marked
+        """
+        seen_at = seen_at or datetime.utcnow().isoformat() + 'Z'
+        
+        by_url = {}
+        for article in articles:
+            url = article.get('url')
+            if url and url not in by_url:
+                by_url[url] = article
+        
+        known = self.content_hashes(by_url)
+        
+        delta = []
+        staged = []
+        unchanged = []
+        for url, article in by_url.items():
+            digest = content_hash(article)
+            if known.get(url) != digest:
+                delta.append(article)
+                staged.append((url, digest, seen_at))
+            else:
+                unchanged.append((seen_at, url))
+        
+        with self.conn:
+            # first_seen keeps the first run that staged the URL
+            self.conn.executemany(
+                """
+                INSERT INTO pending (url, content_hash, first_seen)
+                VALUES (?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash
+                """,
+                staged
+            )
+            self.conn.executemany("UPDATE articles SET last_seen = ? WHERE url = ?", unchanged)
+        
+        return delta
+    
+    def mark(self, articles, seen_at=None):
+        """
+        Record staged articles as seen (call after they were delivered)
+        
+        Args:
+            articles (list): Article dictionaries (or URLs) returned by update()
+            seen_at (str): ISO timestamp for last_seen (defaults to now)
+            
+        Returns:
+            int: Articles recorded (URLs that weren't staged are ignored)
+        """
+        seen_at = seen_at or datetime.utcnow().isoformat() + 'Z'
+        urls = [article if isinstance(article, str) else article.get('url') for article in articles]
+        urls = [url for url in urls if url]
+        
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO articles (url, content_hash, first_seen, last_seen)
+                SELECT url, content_hash, first_seen, ? FROM pending WHERE url = ?
+                ON CONFLICT(url) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    last_seen = excluded.last_seen
+                """,
+                [(seen_at, url) for url in urls]
+            )
+            recorded = self.conn.total_changes - before
+            self.conn.executemany("DELETE FROM pending WHERE url = ?", [(url,) for url in urls])
+        return recorded
+    
+    def discard(self, urls):
+        """
+        Drop staged URLs that won't be delivered (e.g. outside the window)
+        
+        Returns:
+            int: Pending rows removed
+        """
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany("DELETE FROM pending WHERE url = ?", [(url,) for url in urls])
+        return self.conn.total_changes - before
+    
+    def first_seen(self, urls):
+        """
+        When each URL was first scraped (recorded or still pending)
+        
+        Returns:
+            dict: url -> ISO timestamp, for the URLs the index knows
+        """
+        urls = list(urls)
+        found = self._lookup("SELECT url, first_seen FROM pending WHERE url IN ({placeholders})", urls)
+        found.update(self._lookup("SELECT url, first_seen FROM articles WHERE url IN ({placeholders})", urls))
+        return found
+    
+    def get(self, url):
+        """
+        Look up one URL
+        
+        Returns:
+            dict or None: contentHash, firstSeen and lastSeen
+        """
+        row = self.conn.execute(
+            "SELECT content_hash, first_seen, last_seen FROM articles WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"contentHash": row[0], "firstSeen": row[1], "lastSeen": row[2]}
+    
+    def __len__(self):
+        """URLs recorded as seen (pending ones not included)"""
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    
+    def pending_count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+
+if __name__ == "__main__":
+    # Test with an in-memory index
+    index = UrlIndex(':memory:')
+    first = index.update([{"url": "https://example.com/1", "title": "One"}])
+    retried = index.update([{"url": "https://example.com/1", "title": "One"}])
+    index.mark(retried)
+    again = index.update([{"url": "https://example.com/1", "title": "One"},
+                          {"url": "https://example.com/2", "title": "Two"}])
+    index.mark(again)
+    edited = index.update([{"url": "https://example.com/1", "title": "One (updated)"}])
+    print(f"new: {len(first)}, unmarked so again {len(retried)}, then {len(again)}, "
+          f"then {len(edited)} changed; {len(index)} known, {index.pending_count()} pending")
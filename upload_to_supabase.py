@@ -1,53 +1,161 @@
 #!/usr/bin/env python3
 """
 Upload scraped articles to Supabase
-Reads from .tmp/articles.json and uploads to Supabase database
+Streams .tmp/articles.ndjson (or .tmp/articles.json, or the --incremental
+delta) into the Supabase database
 """
 
-import json
+import argparse
 import sys
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent / "tools"))
 
-from supabase_client import SupabaseClient
+from supabase_client import SupabaseClient, article_to_row
+from sync_manifest import SyncManifest
+from url_index import UrlIndex
+from ndjson import iter_articles_file, iter_batches
+from archive import ArticleArchive
 
 
-def upload_articles():
-    """Upload articles from local JSON to Supabase"""
-    
-    # Read articles from local file
-    articles_file = Path(__file__).parent / ".tmp" / "articles.json"
+TMP_DIR = Path(__file__).parent / ".tmp"
+
+# Articles read per chunk; each chunk is upserted in parallel batches
+STREAM_CHUNK = 2000
+
+
+def find_articles_file():
+    """Newest of .tmp/articles.delta.ndjson, .tmp/articles.ndjson and .tmp/articles.json, or None"""
+    names = ("articles.delta.ndjson", "articles.ndjson", "articles.json")
+    candidates = [TMP_DIR / name for name in names if (TMP_DIR / name).exists()]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda path: path.stat().st_mtime)
+
+
+def upload_articles(full=False, path=None, chunk_size=STREAM_CHUNK, archive=False, since=None, until=None):
+    """
+    Upload articles from a local file to Supabase
     
-    if not articles_file.exists():
-        print("❌ Error: articles.json not found")
-        print("💡 Run 'python3 scrape_all.py' first to generate articles")
-        return False
+    NDJSON files are streamed chunk by chunk, so memory stays flat no
+    matter how large the archive is (legacy .json arrays are loaded whole).
+    Only articles that are new or changed since the last successful upload
+    (per .tmp/sync_manifest.sqlite3, committed after every batch) are sent, unless full is True. Articles
+    that are in Supabase afterwards are marked as seen in the
+    scrape_all --incremental URL index, so they leave the delta.
     
-    print("📖 Reading articles from .tmp/articles.json...")
-    with open(articles_file, 'r', encoding='utf-8') as f:
-        articles = json.load(f)
+    Args:
+        full (bool): Resend every article, ignoring the sync manifest
+        path (str): Articles file (default: newest of .tmp/articles.ndjson / .json)
+        chunk_size (int): Articles read and uploaded per chunk
+        archive (bool): Upload from the .tmp/archive/ history instead of a file
+        since (str): With archive, only articles at or after this timestamp
+        until (str): With archive, only articles before this timestamp
+    """
     
-    print(f"   ✓ Found {len(articles)} articles")
+    if archive:
+        article_archive = ArticleArchive(str(TMP_DIR / "archive"))
+        print(f"📖 Reading archived articles ({since or 'start'} to {until or 'now'})...")
+        articles = (article.to_dict() for article in article_archive.query(since, until))
+    else:
+        # Read articles from local file
+        articles_file = Path(path) if path else find_articles_file()
+        
+        if articles_file is None or not articles_file.exists():
+            print("❌ Error: articles.json not found")
+            print("💡 Run 'python3 scrape_all.py' first to generate articles")
+            return False
+        
+        print(f"📖 Streaming articles from {articles_file}...")
+        articles = iter_articles_file(str(articles_file))
     
-    # Upload to Supabase
-    print("\n☁️  Uploading to Supabase...")
+    manifest = SyncManifest(str(TMP_DIR / "sync_manifest.sqlite3"))
+    url_index_path = TMP_DIR / "url_index.sqlite3"
+    url_index = UrlIndex(str(url_index_path)) if url_index_path.exists() else None
     client = SupabaseClient()
-    result = client.insert_articles(articles)
+    totals = {"found": 0, "inserted": 0, "updated": 0, "skipped": 0,
+              "uploaded": 0, "failed": 0, "batches": 0}
+    errors = []
     
-    if result["success"]:
-        print(f"   ✅ Successfully uploaded {result['count']} articles to Supabase!")
+    for chunk in iter_batches(articles, chunk_size):
+        totals["found"] += len(chunk)
+        
+        # Diff against what was last pushed
+        rows = [article_to_row(article) for article in chunk]
+        pending, stats = manifest.plan(rows)
+        if full:
+            # Resend unchanged rows too
+            pending = rows
+            stats["updated"] += stats["skipped"]
+            stats["skipped"] = 0
+        for key in ("inserted", "updated", "skipped"):
+            totals[key] += stats[key]
+        
+        pending_ids = {row["article_id"] for row in pending}
+        if url_index is not None:
+            # Already in Supabase, unchanged
+            url_index.mark([article for article in chunk if article.get("id") not in pending_ids])
+        
+        if not pending:
+            continue
+        
+        to_upload = [article for article in chunk if article.get("id") in pending_ids]
+        
+        result = client.insert_articles(to_upload)
+        
+        # Record every batch that made it, even if others failed
+        for batch in result["batches"]:
+            if batch["success"]:
+                end = batch["start"] + batch["size"]
+                manifest.mark_synced(pending[batch["start"]:end])
+                if url_index is not None:
+                    url_index.mark(to_upload[batch["start"]:end])
+        totals["uploaded"] += result["count"]
+        totals["failed"] += result["failed"]
+        totals["batches"] += len(result["batches"])
+        if not result["success"]:
+            errors.append(result["error"])
+        print(f"   ☁️  Uploaded {totals['uploaded']} of {totals['found']} articles read...")
+    
+    manifest.close()
+    if url_index is not None:
+        url_index.close()
+    
+    print(f"   ✓ Found {totals['found']} articles")
+    print(f"   ✓ {totals['inserted']} new, {totals['updated']} changed, {totals['skipped']} unchanged (skipped)")
+    
+    if totals["batches"] == 0 and not errors:
+        print("\n✅ Nothing to upload, Supabase is up to date")
+        return True
+    
+    print(f"   📦 {totals['batches']} batch(es), {totals['failed']} rows failed")
+    
+    if not errors:
+        print(f"   ✅ Successfully uploaded {totals['uploaded']} articles to Supabase!")
+        print(f"   📊 Inserted: {totals['inserted']}, updated: {totals['updated']}, skipped: {totals['skipped']}")
         return True
     else:
-        print(f"   ❌ Error: {result['error']}")
+        print(f"   ❌ Error: {'; '.join(errors)}")
         return False
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload scraped articles to Supabase")
+    parser.add_argument("--full", action="store_true",
+                        help="Send every article, ignoring the sync manifest")
+    parser.add_argument("--input", help="Articles file (.ndjson or .json)")
+    parser.add_argument("--archive", action="store_true",
+                        help="Upload from the .tmp/archive/ history instead of the latest run")
+    parser.add_argument("--since", help="With --archive: start timestamp (ISO 8601)")
+    parser.add_argument("--until", help="With --archive: end timestamp (ISO 8601)")
+    args = parser.parse_args()
+    
     print("🚀 Supabase Article Uploader\n")
     
-    success = upload_articles()
+    success = upload_articles(full=args.full, path=args.input, archive=args.archive,
+                              since=args.since, until=args.until)
     
     if success:
         print("\n✅ Upload complete!")